@@ -2,7 +2,7 @@
 import os, json, time, uuid
 from typing import Optional, Dict, Any, List, Tuple
 
-from .deps import load_redis_module
+from .deps import load_redis_module, redis_url
 
 redis = load_redis_module()
 
@@ -10,7 +10,7 @@ def _now_ms() -> int:
     """UTC wall-clock in milliseconds, for created_at/updated_at fields."""
     return int(time.time() * 1000)
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_URL = redis_url(default="redis://localhost:6379/0")
 
 ANSWERS_TTL_S = int(os.getenv("ANSWERS_TTL_S", "86400"))  # 24h
 
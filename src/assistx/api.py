@@ -26,7 +26,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from neo4j.exceptions import ServiceUnavailable
 from pydantic import BaseModel, ConfigDict, Field
-from .deps import load_aioredis_module, load_prometheus_client, load_queue_class, load_redis_module, multipart_available
+from .deps import load_aioredis_module, load_prometheus_client, load_queue_class, load_redis_module, multipart_available, redis_url
 from .logging_utils import install_logging_middleware, setup_logging
 from .runtime import build_runtime_health, runtime_profile, validate_runtime_configuration
 
@@ -34,7 +34,7 @@ CONTENT_TYPE_LATEST, generate_latest = load_prometheus_client()
 redis = load_redis_module()
 aioredis = load_aioredis_module()
 Queue = load_queue_class()
-from .metrics import QA_REQUESTS, JOBS_ENQUEUED, TASK_CLAIMS, TASK_COMPLETIONS, TASK_HEARTBEATS, CONTEXT_PACKETS
+from .metrics import QA_SYNC_STARTED, QA_SYNC_DONE, QA_SYNC_FAILED, JOBS_ENQUEUED, TASK_CLAIMS, TASK_COMPLETIONS, TASK_HEARTBEATS, CONTEXT_PACKETS
 from .metrics import RQ_JOBS_IN_QUEUE, RQ_JOBS_RUNNING, RQ_JOBS_FAILED
 from .metrics import REQUESTS
 from .idempotency_store import save as idemp_save, load as idemp_load
@@ -54,7 +54,7 @@ from .agents.orchestrator import run_task
 from .pipeline.qa_pipeline import answer_question
 from .queue import get_q
 from .jobs import execute_task_job, ask_question_job
-from .metrics import EXECUTIONS
+from .metrics import EXECUTIONS_ENQUEUED
 from .answers_store import get_answer, _chan as _answer_channel
 from .answers_store import _global_chan
 from . import answers_store
@@ -1246,7 +1246,7 @@ def execute_task(task_id: str, dry_run: bool = False, user: str = Depends(auth))
 def enqueue_task(task_id: str, dry_run: bool = False, user: str = Depends(auth)):
     q = get_q()
     job = q.enqueue(execute_task_job, task_id, dry_run)
-    EXECUTIONS.labels(status="ENQUEUED").inc()
+    EXECUTIONS_ENQUEUED.inc()
     return {"enqueued": True, "job_id": job.get_id(), "task_id": task_id}
 
 @app.get("/runs", response_class=HTMLResponse)
@@ -2746,7 +2746,7 @@ def api_enqueue_task(task_id: str, dry_run: bool = False, user: str = Depends(au
             return {"enqueued": False, "already": True, "status_code": 409, "task_id": task_id}
         q = get_q()
         job = q.enqueue(execute_task_job, task_id, dry_run)
-        EXECUTIONS.labels(status="ENQUEUED").inc()
+        EXECUTIONS_ENQUEUED.inc()
         return {"enqueued": True, "job_id": job.get_id(), "task_id": task_id}
     finally:
         neo.close()
@@ -3722,7 +3722,7 @@ def api_ask(body: AskIn, user: str = Depends(auth)):
                 return JSONResponse(status_code=202, content={"answer_id": existing["id"], "job_id": existing.get("job_id"), "status_url": f"/api/answers/{existing['id']}", "status": existing.get("status"), "idempotent": True, **(existing.get("meta") or {})})
 
     if mode == "sync":
-        QA_REQUESTS.labels(mode="sync", status="started").inc()
+        QA_SYNC_STARTED.inc()
         neo = _neo()
         deliverable = None
         try:
@@ -3744,7 +3744,7 @@ def api_ask(body: AskIn, user: str = Depends(auth)):
             out["deliverable_status"] = completed.get("status") if completed else "UNKNOWN"
             if body.idempotency_key:
                 idemp_save(body.idempotency_key, {"sync_result": out})
-            QA_REQUESTS.labels(mode="sync", status="done").inc()
+            QA_SYNC_DONE.inc()
             return out
         except Exception as e:
             if deliverable:
@@ -3757,7 +3757,7 @@ def api_ask(body: AskIn, user: str = Depends(auth)):
                     )
                 except Exception:
                     pass
-            QA_REQUESTS.labels(mode="sync", status="failed").inc()
+            QA_SYNC_FAILED.inc()
             raise
         finally:
             neo.close()
@@ -3827,7 +3827,7 @@ async def ws_answer_events(websocket: WebSocket, answer_id: str, token: Optional
         await websocket.close(code=1008)
         return
     await websocket.accept()
-    r = aioredis.from_url(REDIS_URL, decode_responses=True)
+    r = aioredis.from_url(redis_url(), decode_responses=True)
     pubsub = r.pubsub()
     chan = _answer_channel(answer_id)
     await pubsub.subscribe(chan)
@@ -3873,7 +3873,7 @@ async def ws_answers(websocket: WebSocket, token: Optional[str] = Query(None)):
         await websocket.close(code=1008)
         return
     await websocket.accept()
-    r = aioredis.from_url(REDIS_URL, decode_responses=True)
+    r = aioredis.from_url(redis_url(), decode_responses=True)
     pubsub = r.pubsub()
     chan = answers_store._global_chan()     # <— FIX: use module
     await pubsub.subscribe(chan)
@@ -3909,7 +3909,7 @@ async def api_answers_events(
     status: str | None = Query(None, description="Optional filter hint; client can also filter"),
     user: str = Depends(auth),
 ):
-    r = aioredis.from_url(REDIS_URL, decode_responses=True)
+    r = aioredis.from_url(redis_url(), decode_responses=True)
     pubsub = r.pubsub()
     chan = answers_store._global_chan()
     await pubsub.subscribe(chan)
@@ -3954,7 +3954,7 @@ async def api_answers_events(
 
 @app.get("/api/answers/{answer_id}/events")
 async def api_answer_events(answer_id: str, request: Request, user: str = Depends(auth)):
-    r = aioredis.from_url(REDIS_URL, decode_responses=True)
+    r = aioredis.from_url(redis_url(), decode_responses=True)
     pubsub = r.pubsub()
     chan = answers_store._chan(answer_id)
     await pubsub.subscribe(chan)
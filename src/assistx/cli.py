@@ -20,8 +20,9 @@ def ingest_cmd(src):
 
 @cli.command("summarize")
 @click.option("--since-days", default=7, show_default=True, type=int)
-def summarize_cmd(since_days):
-    neo = Neo4jClient(); summarize_since_days(neo, days=since_days); neo.close()
+@click.option("--enqueue", is_flag=True, default=False, help="Fan out one RQ job per conversation instead of summarizing inline")
+def summarize_cmd(since_days, enqueue):
+    neo = Neo4jClient(); summarize_since_days(neo, days=since_days, enqueue=enqueue); neo.close()
 
 @cli.command("execute")
 @click.option("--limit", default=5, show_default=True, type=int)
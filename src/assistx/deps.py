@@ -13,6 +13,23 @@ def use_compat_shims() -> bool:
     return dependency_mode() in {"compat", "test", "testing", "minimal", "dev", "development"}
 
 
+REDIS_SOCKET = os.getenv("REDIS_SOCKET", "/var/run/redis/redis.sock")
+
+
+def redis_url(default: str = "redis://redis:6379/0") -> str:
+    """REDIS_URL, else the local Unix socket when Redis shares the host, else ``default``.
+
+    Workers and producers both resolve through here so they always meet on the same Redis.
+    ``default`` is the compose service; stores that run beside a local Redis pass localhost.
+    """
+    url = os.getenv("REDIS_URL")
+    if url:
+        return url
+    if os.path.exists(REDIS_SOCKET):
+        return f"unix://{REDIS_SOCKET}"
+    return default
+
+
 def load_redis_module():
     if use_compat_shims():
         from .compat import InMemoryRedis as redis_module
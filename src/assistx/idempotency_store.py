@@ -1,11 +1,11 @@
 import os, json, time
 from typing import Optional, Dict, Any
 
-from .deps import load_redis_module
+from .deps import load_redis_module, redis_url
 
 redis = load_redis_module()
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_URL = redis_url(default="redis://localhost:6379/0")
 IDEMP_TTL_S = int(os.getenv("IDEMP_TTL_S", "3600"))
 _r = redis.from_url(REDIS_URL, decode_responses=True)
 
@@ -8,7 +8,7 @@ import uuid
 from datetime import timedelta
 from typing import Any, Dict, List, Optional
 
-from .deps import load_get_current_job, load_redis_module
+from .deps import load_get_current_job, load_redis_module, redis_url
 
 redis_module = load_redis_module()
 get_current_job = load_get_current_job()
@@ -17,7 +17,7 @@ _redis = None
 def _get_redis():
     global _redis
     if _redis is None:
-        _redis = redis_module.Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
+        _redis = redis_module.Redis.from_url(redis_url())
     return _redis
 
 from .queue import get_q
@@ -1,18 +1,21 @@
 
 from __future__ import annotations
+
 import logging
-from .agents.orchestrator import run_task, _json_safe
-from .acceptance import evaluate_acceptance
-import os, traceback
+import os
+import traceback
 from typing import Optional
+
+from .acceptance import evaluate_acceptance
+from .agents.orchestrator import _json_safe, run_task
 from .deps import load_get_current_job
 
 get_current_job = load_get_current_job()
+from . import answers_store
+from .answers_store import set_error, set_result, set_status
+from .metrics import JOBS_FAILED, JOBS_STARTED, JOBS_SUCCEEDED
 from .neo4j_client import Neo4jClient
 from .pipeline.qa_pipeline import answer_question
-from .answers_store import set_status, set_result, set_error
-from .metrics import JOBS_STARTED, JOBS_SUCCEEDED, JOBS_FAILED
-from . import answers_store
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +32,11 @@ def execute_task_job(task_id: str, dry_run: bool = False):
         rid = state.get('run_id')
         acc = evaluate_acceptance(neo, t, rid) if rid else {"passed": True}
         final_status = "DONE" if (acc.get('passed') or dry_run) else "FAILED"
+        tool_log = None
         if rid:
-            neo.log_tool_call(rid, 'acceptance', {'task_id': task_id, 'acceptance': t.get('acceptance')}, acc, final_status=='DONE')
-        neo.update_task_status(task_id, final_status)
+            tool_log = {"run_id": rid, "tool": "acceptance", "input_json": {'task_id': task_id, 'acceptance': t.get('acceptance')},
+                        "output_json": acc, "ok": final_status == 'DONE'}
+        neo.task_transition(task_id, final_status, tool_log=tool_log)
         return _json_safe({"status": final_status, "state": state, "task_id": task_id, "acceptance": acc})
     except Exception as e:
         neo.update_task_status(task_id, "FAILED")
@@ -40,6 +45,29 @@ def execute_task_job(task_id: str, dry_run: bool = False):
         neo.close()
 
 
+def summarize_conversation_job(conversation_id: str):
+    from .pipeline_summarize import summarize_conversation
+    neo = Neo4jClient()
+    try:
+        summarize_conversation(neo, conversation_id)
+        return {"conversation_id": conversation_id}
+    finally:
+        neo.close()
+
+
+def transcribe_job(audio_path: str, out_root: str, model_name: Optional[str] = None, batch_size: int = 1):
+    import pathlib
+
+    from .tools.transcribe import get_model, model_language, stream_transcription
+    path = pathlib.Path(audio_path)
+    out = pathlib.Path(out_root)
+    out.mkdir(parents=True, exist_ok=True)
+    model_name = model_name or os.getenv("WHISPER_MODEL", "tiny")
+    obj = stream_transcription(get_model(model_name, None, batch_size), path, out, batch_size=batch_size,
+                               language=model_language(model_name))
+    return {"key": obj["key"], "segments": obj["segments"], "source_json": obj["source_json"]}
+
+
 def ask_question_job(
     answer_id: str,
     question: str,
@@ -47,7 +75,7 @@ def ask_question_job(
     max_repairs: int = 3,
     deliverable_id: Optional[str] = None,
 ) -> None:
-    from .answers_store import set_status, set_result, set_error
+    from .answers_store import set_error, set_result, set_status
     job = get_current_job()
     job_id = job.get_id() if job else None
     JOBS_STARTED.inc()
@@ -120,8 +148,9 @@ def ask_question_job(
                 )
             except Exception:
                 pass
-        import traceback
-        tb = "".join(traceback.format_exception(type(e), e, e.__traceback__))
+        # Bound the formatted traceback so error storms stay cheap; the full
+        # trace still goes to the log via logger.exception below.
+        tb = "".join(traceback.format_exception(type(e), e, e.__traceback__, limit=20))
         set_error(answer_id, tb)
         logger.exception(
             "qa_job_failed answer_id=%s job_id=%s deliverable_id=%s",
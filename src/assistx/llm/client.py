@@ -18,6 +18,9 @@ LLM_MODEL = os.getenv("LLM_MODEL", os.getenv("OLLAMA_MODEL", "llama3.1:8b"))
 EMBED_MODEL = os.getenv("EMBED_MODEL", os.getenv("QA_EMBED_QUERY_MODEL", "nomic-embed-text"))
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 TIMEOUT = int(os.getenv("LLM_TIMEOUT_S", "30"))
+# Keeps the Ollama model (and its KV cache for shared prompt prefixes)
+# resident between calls.
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
 # HTTP timeout used when probing whether a model is hot.  Long enough to let a
 # model that is genuinely loaded respond, but short enough that a model which is
 # NOT loaded (and would need a multi-second cold load) is correctly skipped.
@@ -759,7 +762,7 @@ def _chat_openai(messages: List[Dict[str, str]], model: str, json_mode: bool, ba
     return msg["content"]
 
 def _chat_ollama(messages: List[Dict[str, str]], model: str, json_mode: bool, base_url: Optional[str] = None, _timeout_override: Optional[int] = None) -> str:
-    payload: Dict[str, Any] = {"model": model, "messages": messages, "stream": False}
+    payload: Dict[str, Any] = {"model": model, "messages": messages, "stream": False, "keep_alive": OLLAMA_KEEP_ALIVE}
     if json_mode:
         payload["format"] = "json"
     r = requests.post(f"{OLLAMA_HOST}/api/chat", json=payload, timeout=_timeout_override or TIMEOUT)
@@ -78,3 +78,12 @@ TASK_CLAIMS = _safe_counter("assistx_task_claims_total", "Task trigger claims",
 TASK_HEARTBEATS = _safe_counter("assistx_task_heartbeats_total", "Task trigger heartbeats", ["status"])
 TASK_COMPLETIONS = _safe_counter("assistx_task_completions_total", "Task trigger completions", ["status"])
 CONTEXT_PACKETS = _safe_counter("assistx_context_packets_total", "Context packets created")
+
+# Pre-bound children for fixed label sets on hot paths: ``.inc()`` on these
+# skips the per-call label-tuple lookup in the parent metric.
+QA_SYNC_STARTED = QA_REQUESTS.labels(mode="sync", status="started")
+QA_SYNC_DONE = QA_REQUESTS.labels(mode="sync", status="done")
+QA_SYNC_FAILED = QA_REQUESTS.labels(mode="sync", status="failed")
+EXECUTIONS_ENQUEUED = EXECUTIONS.labels(status="ENQUEUED")
+EXECUTIONS_DONE = EXECUTIONS.labels(status="DONE")
+EXECUTIONS_FAILED = EXECUTIONS.labels(status="FAILED")
@@ -4,7 +4,7 @@ import logging
 import os
 from datetime import timedelta
 
-from .deps import load_get_current_job, load_redis_module
+from .deps import load_get_current_job, load_redis_module, redis_url
 
 redis_module = load_redis_module()
 get_current_job = load_get_current_job()
@@ -47,7 +47,7 @@ def _reschedule() -> None:
 
 
 def schedule_prober() -> None:
-    r = redis_module.Redis.from_url(os.getenv("REDIS_URL", "redis://redis:6379/0"))
+    r = redis_module.Redis.from_url(redis_url())
     lock_key = "assistx:model_prober:scheduled"
     if r.setnx(lock_key, "1"):
         r.expire(lock_key, 60)
@@ -17,6 +17,46 @@ _UNSET = object()
 EXECUTABLE_TASK_STATUSES = {"READY", "CLAIMED", "RUNNING", "DONE", "FAILED", "CANCELLED"}
 TERMINAL_TASK_STATUSES = {"DONE", "FAILED", "CANCELLED"}
 
+# Task properties pulled by the executor's READY poll. Projecting these
+# instead of returning the whole node keeps unrelated blobs off the wire.
+# The REVIEW listing returns whole nodes: the review API and UI read
+# timestamps, reviewer and intent metadata that vary per task.
+READY_TASK_FIELDS = (
+    "id", "title", "description", "kind", "status", "priority", "due", "model",
+    "acceptance", "conversation_id", "created_at_ts",
+)
+
+
+def _projection(fields: Iterable[str]) -> str:
+    return ", ".join(f".{f}" for f in fields)
+
+
+_TOOL_CALL_CYPHER = (
+    "MATCH (r:AgentRun{id:$rid}) "
+    "WITH r, datetime() AS now, timestamp() AS now_ts "
+    "CREATE (k:ToolCall {id:$call_id, run_id:$rid, tool:$tool, input_json:$in, output_json:$out, ok:$ok, "
+    " started_at:now, started_at_ts:now_ts, ended_at:now, ended_at_ts:now_ts, "
+    " created_at:now, created_at_ts:now_ts, "
+    " updated_at:now, updated_at_ts:now_ts}) "
+    "MERGE (r)-[:USED_TOOL]->(k)"
+)
+
+
+def _tool_call_params(run_id: str, tool: str, input_json: Any, output_json: Any, ok: bool) -> Dict[str, Any]:
+    return {
+        "rid": run_id,
+        "call_id": uuid.uuid4().hex,
+        "tool": tool,
+        "in": json.dumps(input_json),
+        "out": json.dumps(output_json) if output_json is not None else None,
+        "ok": ok,
+    }
+
+
+def _drop_nulls(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Map projections yield null for absent properties; callers expect them missing.
+    return {k: v for k, v in row.items() if v is not None}
+
 
 class Neo4jClient:
     """
@@ -1684,10 +1724,10 @@ class Neo4jClient:
         """
         q = (
             "MERGE (u:Utterance {id:$id}) "
-            "SET u += $props "
-            "SET u.created_at = coalesce(u.created_at, datetime()), "
-            "    u.created_at_ts = coalesce(u.created_at_ts, timestamp()) "
-            "SET u.updated_at = datetime(), "
+            "ON CREATE SET u.created_at = datetime(), "
+            "              u.created_at_ts = timestamp() "
+            "SET u += $props, "
+            "    u.updated_at = datetime(), "
             "    u.updated_at_ts = timestamp() "
             "WITH u "
             "MATCH (c:Conversation {id:$cid}) "
@@ -1726,11 +1766,11 @@ class Neo4jClient:
     def get_ready_tasks(self, limit: int = 10) -> List[Dict[str, Any]]:
         q = (
             "MATCH (t:Task {status:'READY'}) "
-            "RETURN t ORDER BY t.created_at_ts ASC LIMIT $limit"
+            f"RETURN t {{{_projection(READY_TASK_FIELDS)}}} AS t ORDER BY t.created_at_ts ASC LIMIT $limit"
         )
         with self._session() as s:
             res = s.run(q, {"limit": limit})
-            return [dict(r["t"]) for r in res]
+            return [_drop_nulls(r["t"]) for r in res]
 
     def get_review_tasks(self, limit: int = 25) -> List[Dict[str, Any]]:
         q = (
@@ -1745,15 +1785,30 @@ class Neo4jClient:
         with self._session() as s:
             s.run("MATCH (t:Task{id:$id}) SET t.status=$st, t.updated_at_ts = timestamp()", {"id": task_id, "st": status})
 
+    def task_transition(self, task_id: str, status: str, tool_log: Optional[Dict[str, Any]] = None) -> None:
+        """Set a task's status and, optionally, record a ToolCall in one write transaction.
+
+        ``tool_log`` takes the keyword arguments of :meth:`log_tool_call`
+        (run_id, tool, input_json, output_json, ok).
+        """
+        def _tx(tx):
+            if tool_log:
+                tx.run(_TOOL_CALL_CYPHER, _tool_call_params(**tool_log))
+            tx.run("MATCH (t:Task{id:$id}) SET t.status=$st, t.updated_at_ts = timestamp()", {"id": task_id, "st": status})
+
+        with self._session() as s:
+            s.execute_write(_tx)
+
     def create_run(self, task_id: str, agent: str, model: str, manifest: Dict[str, Any]):
         run_id = uuid.uuid4().hex
         with self._session() as s:
             rec = s.run(
                 "MATCH (t:Task{id:$tid}) "
+                "WITH t, datetime() AS now, timestamp() AS now_ts "
                 "CREATE (r:AgentRun {id:$run_id, task_id:$tid, agent:$agent, model:$model, status:'RUNNING', "
-                " started_at:datetime(), started_at_ts:timestamp(), manifest_json:$manifest, "
-                " created_at:datetime(), created_at_ts:timestamp(), "
-                " updated_at:datetime(), updated_at_ts:timestamp()}) "
+                " started_at:now, started_at_ts:now_ts, manifest_json:$manifest, "
+                " created_at:now, created_at_ts:now_ts, "
+                " updated_at:now, updated_at_ts:now_ts}) "
                 "MERGE (t)-[:EXECUTED_BY]->(r) RETURN r.id as id",
                 {"tid": task_id, "run_id": run_id, "agent": agent, "model": model, "manifest": json.dumps(manifest)},
             ).single()
@@ -1766,27 +1821,23 @@ class Neo4jClient:
             if result_json is not None:
                 extra = ", r.result_json=$rj"
                 params["rj"] = json.dumps(result_json)
-            s.run(f"MATCH (r:AgentRun{{id:$id}}) SET r.status=$st, r.ended_at=datetime(), r.ended_at_ts=timestamp(){extra}", params)
+            s.run(
+                "MATCH (r:AgentRun{id:$id}) WITH r, datetime() AS now, timestamp() AS now_ts "
+                f"SET r.status=$st, r.ended_at=now, r.ended_at_ts=now_ts{extra}",
+                params,
+            )
 
     def log_tool_call(self, run_id: str, tool: str, input_json: Dict[str, Any], output_json: Dict[str, Any] | None, ok: bool):
-        call_id = uuid.uuid4().hex
         with self._session() as s:
-            s.run(
-                "MATCH (r:AgentRun{id:$rid}) "
-                "CREATE (k:ToolCall {id:$call_id, run_id:$rid, tool:$tool, input_json:$in, output_json:$out, ok:$ok, "
-                " started_at:datetime(), started_at_ts:timestamp(), ended_at:datetime(), ended_at_ts:timestamp(), "
-                " created_at:datetime(), created_at_ts:timestamp(), "
-                " updated_at:datetime(), updated_at_ts:timestamp()}) "
-                "MERGE (r)-[:USED_TOOL]->(k)",
-                {"rid": run_id, "call_id": call_id, "tool": tool, "in": json.dumps(input_json), "out": json.dumps(output_json) if output_json is not None else None, "ok": ok},
-            )
+            s.run(_TOOL_CALL_CYPHER, _tool_call_params(run_id, tool, input_json, output_json, ok))
 
     def log_artifact(self, run_id: str, kind: str, path: str, sha256: str | None):
         artifact_id = uuid.uuid4().hex
         with self._session() as s:
             s.run(
                 "MATCH (r:AgentRun{id:$rid}) "
-                "CREATE (a:Artifact {id:$artifact_id, run_id:$rid, kind:$k, path:$p, sha256:$h, created_at:datetime(), created_at_ts:timestamp(), updated_at:datetime(), updated_at_ts:timestamp()}) "
+                "WITH r, datetime() AS now, timestamp() AS now_ts "
+                "CREATE (a:Artifact {id:$artifact_id, run_id:$rid, kind:$k, path:$p, sha256:$h, created_at:now, created_at_ts:now_ts, updated_at:now, updated_at_ts:now_ts}) "
                 "MERGE (r)-[:PRODUCED]->(a)",
                 {"rid": run_id, "artifact_id": artifact_id, "k": kind, "p": path, "h": sha256},
             )
@@ -6,34 +6,39 @@ def fetch_schema(neo: Neo4jClient) -> Dict[str, Any]:
     Returns a compact schema model:
       { "nodes": [{"label":"Conversation","props":["id","title",...]}],
         "rels": [{"type":"HAS_UTTERANCE","from":["Conversation"],"to":["Utterance"]}] }
+
+    Uses the db.schema.* procedures, so the whole fetch is two round-trips.
+    They are not free on large graphs: db.schema.nodeTypeProperties samples or
+    scans the node store to find property keys, and db.schema.visualization
+    only reports label pairs it can derive from the store's counts.
     """
-    nodes, rels = [], []
+    node_props: Dict[str, set] = {}
+    rel_ends: Dict[str, tuple] = {}
 
     with neo.driver.session() as s:
-        # Node labels and sample keys
-        labels = [r["label"] for r in s.run("CALL db.labels() YIELD label RETURN label")]
-        for lb in labels:
-            props = []
-            res = s.run(f"MATCH (n:`{lb}`) WITH n LIMIT 50 RETURN keys(n) AS ks")
-            seen = set()
-            for row in res:
-                for k in row["ks"]:
-                    if k not in seen:
-                        seen.add(k)
-            nodes.append({"label": lb, "props": sorted(seen)})
+        # Label -> property keys (a node with several labels contributes to each)
+        res = s.run(
+            "CALL db.schema.nodeTypeProperties() YIELD nodeLabels, propertyName "
+            "RETURN nodeLabels, collect(DISTINCT propertyName) AS props"
+        )
+        for row in res:
+            for lb in row["nodeLabels"] or []:
+                node_props.setdefault(lb, set()).update(p for p in row["props"] if p)
 
-        # Relationship types and sample endpoints
-        rtypes = [r["relationshipType"] for r in s.run("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType")]
-        for rt in rtypes:
-            row = s.run(
-                f"""
-                MATCH (a)-[r:`{rt}`]->(b)
-                WITH labels(a) AS la, labels(b) AS lb LIMIT 100
-                RETURN collect(DISTINCT la) AS froms, collect(DISTINCT lb) AS tos
-                """
-            ).single()
-            froms = sorted({tuple(x) for x in (row["froms"] or [])})
-            tos   = sorted({tuple(x) for x in (row["tos"] or [])})
-            rels.append({"type": rt, "from": ["/".join(x) for x in froms], "to": ["/".join(x) for x in tos]})
+        # Relationship types with their endpoint labels
+        res = s.run(
+            "CALL db.schema.visualization() YIELD relationships "
+            "UNWIND relationships AS r "
+            "RETURN type(r) AS type, labels(startNode(r)) AS la, labels(endNode(r)) AS lb"
+        )
+        for row in res:
+            froms, tos = rel_ends.setdefault(row["type"], (set(), set()))
+            froms.add(tuple(row["la"] or []))
+            tos.add(tuple(row["lb"] or []))
 
+    nodes: List[Dict[str, Any]] = [{"label": lb, "props": sorted(props)} for lb, props in sorted(node_props.items())]
+    rels: List[Dict[str, Any]] = [
+        {"type": rt, "from": ["/".join(x) for x in sorted(froms)], "to": ["/".join(x) for x in sorted(tos)]}
+        for rt, (froms, tos) in sorted(rel_ends.items())
+    ]
     return {"nodes": nodes, "rels": rels}
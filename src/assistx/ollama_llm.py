@@ -82,13 +82,16 @@ def json_chat(prompt: str, schema_hint: str | None = None, temperature: float =
 
 
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=0.8, min=0.5, max=4), reraise=True)
-def text_chat(prompt: str, temperature: float = 0.2) -> str:
+def text_chat(prompt: str, temperature: float = 0.2, system: str | None = None) -> str:
+    """Plain-text chat. ``system`` is appended to the system message; keep it
+    byte-identical across related calls so the backend can reuse the cached prefix."""
     model = _active_model()
-    key = make_key(model, f"TEXT|{prompt}", mode="text")
+    system_msg = SYSTEM_BASE + ("\n\n" + system if system else "")
+    key = make_key(model, f"TEXT|{system or ''}|{prompt}", mode="text")
 
     def _do():
         messages = [
-            {"role": "system", "content": SYSTEM_BASE},
+            {"role": "system", "content": system_msg},
             {"role": "user", "content": prompt},
         ]
         return _chat(messages, model=model).strip()
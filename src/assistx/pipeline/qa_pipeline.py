@@ -4,7 +4,7 @@ import os, json, hashlib
 import time
 import math
 from typing import Dict, Any, Optional
-from ..deps import load_redis_module
+from ..deps import load_redis_module, redis_url
 import requests
 
 redis = load_redis_module()
@@ -18,7 +18,7 @@ from ..llm_client import embed as _llm_embed
 from ..metrics import QA_DURATION, QA_CYPHER_ATTEMPTS
 
 # ---- cache config ----
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+REDIS_URL = redis_url(default="redis://localhost:6379/0")
 QA_CACHE_TTL_S = int(os.getenv("QA_CACHE_TTL_S", "3600"))  # 1h default
 CACHE_VERSION = "v1"
 QA_SIMILARITY_THRESHOLD = float(os.getenv("QA_SIMILARITY_THRESHOLD", "0.92"))
@@ -4,11 +4,13 @@ from .neo4j_client import Neo4jClient
 from .agents.orchestrator import run_task
 from .logging_utils import get_logger
 from .acceptance import evaluate_acceptance
+from .metrics import EXECUTIONS_DONE, EXECUTIONS_FAILED
 
 logger = get_logger()
 
 def execute_ready(neo: Neo4jClient, limit: int = 5, dry_run: bool = False):
     tasks = neo.get_ready_tasks(limit=limit)
+    done = failed = 0
     for t in tasks:
         neo.update_task_status(t["id"], "RUNNING")
         state = run_task(neo, dict(t), dry_run=dry_run)
@@ -16,7 +18,18 @@ def execute_ready(neo: Neo4jClient, limit: int = 5, dry_run: bool = False):
         result = state.get('result')
         acc = evaluate_acceptance(neo, t, rid) if rid else {"passed": bool(result)}
         final_status = "DONE" if (acc.get('passed') or dry_run) else "FAILED"
+        tool_log = None
         if rid:
-            neo.log_tool_call(rid, 'acceptance', {'task_id': t['id'], 'acceptance': t.get('acceptance')}, acc, final_status=='DONE')
-        neo.update_task_status(t["id"], final_status)
+            tool_log = {"run_id": rid, "tool": "acceptance", "input_json": {'task_id': t['id'], 'acceptance': t.get('acceptance')},
+                        "output_json": acc, "ok": final_status == 'DONE'}
+        neo.task_transition(t["id"], final_status, tool_log=tool_log)
         logger.info(f"Executed {t['id']} -> {final_status}; acceptance: {acc}")
+        if final_status == "DONE":
+            done += 1
+        else:
+            failed += 1
+    # One increment per batch rather than per task.
+    if done:
+        EXECUTIONS_DONE.inc(done)
+    if failed:
+        EXECUTIONS_FAILED.inc(failed)
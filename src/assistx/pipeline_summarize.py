@@ -6,7 +6,7 @@ from .schemas import ExtractedTasks
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 from .logging_utils import get_logger
-import json, difflib
+import bisect, functools, itertools, json, difflib, re
 
 logger = get_logger()
 
@@ -14,6 +14,11 @@ SUMMARIZE_PROMPT = Path(__file__).with_suffix("").parent / "prompts" / "summariz
 TASKS_PROMPT = Path(__file__).with_suffix("").parent / "prompts" / "tasks.md"
 CRITIC_PROMPT = Path(__file__).with_suffix("").parent / "prompts" / "critic.md"
 
+@functools.cache
+def _load_prompt(path: Path) -> str:
+    # Prompt files are static; read each once per process.
+    return path.read_text()
+
 def chunk_texts(texts: List[str], max_chars: int = 6000) -> List[str]:
     chunks, buf = [], ""
     for t in texts:
@@ -25,16 +30,20 @@ def chunk_texts(texts: List[str], max_chars: int = 6000) -> List[str]:
     if buf: chunks.append(buf)
     return chunks
 
+# Keyword triggers for inferred acceptance checks; a leading word boundary
+# keeps plurals/suffixes ("reports", "https") matching.
+_RX_FILE = re.compile(r"\b(?:write|generate|draft|report|summary|export|save|file)", re.IGNORECASE)
+_RX_SUMMARY = re.compile(r"\b(?:summary|report|analysis)", re.IGNORECASE)
+_RX_HTTP = re.compile(r"\b(?:publish|post|url|endpoint|api|site|http)", re.IGNORECASE)
+
 def infer_acceptance(task: dict) -> list[dict] | None:
-    title = (task.get("title") or "").lower()
-    desc = (task.get("description") or "").lower()
     checks = []
-    text = title + " " + desc
-    if any(w in text for w in ["write","generate","draft","report","summary","export","save","file"]):
+    text = f"{task.get('title') or ''} {task.get('description') or ''}"
+    if _RX_FILE.search(text):
         checks.append({"type": "file_exists", "args": {"path": "artifacts/{task_id}/output.txt"}})
-    if any(w in text for w in ["summary","report","analysis"]):
+    if _RX_SUMMARY.search(text):
         checks.append({"type": "contains", "args": {"path": "artifacts/{task_id}/output.txt", "text": "Summary"}})
-    if any(w in text for w in ["publish","post","url","endpoint","api","site","http"]):
+    if _RX_HTTP.search(text):
         checks.append({"type": "http_ok", "args": {"url": "https://example.com/replace-with-real"}})
     return checks or None
 
@@ -72,34 +81,43 @@ def ground_bullets(bullets: list[str], source_text: str) -> list[dict]:
 
 def summarize_conversation(neo: Neo4jClient, conversation_id: str):
     # Pull utterances (ids + text) in chronological order
+    uids: List[str] = []
+    texts: List[str] = []
     with neo.driver.session() as s:
-        res = s.run("MATCH (c:Conversation{id:$id})-[:HAS_UTTERANCE]->(u:Utterance) RETURN u.id, u.text ORDER BY u.started_at, u.id", {"id": conversation_id})
-        utts = [(r[0], r[1]) for r in res]
-    if not utts:
+        res = s.run(
+            "MATCH (c:Conversation{id:$id})-[:HAS_UTTERANCE]->(u:Utterance) WHERE u.text IS NOT NULL "
+            "RETURN u.id, u.text ORDER BY u.started_at, u.id",
+            {"id": conversation_id},
+        )
+        for r in res:
+            uids.append(r[0])
+            texts.append(r[1])
+    if not texts:
         return
 
-    texts = [u[1] for u in utts]
-    base_instr = SUMMARIZE_PROMPT.read_text()
+    base_instr = _load_prompt(SUMMARIZE_PROMPT)
     chunks = chunk_texts(texts)
 
+    # The instructions ride in the system message so every chunk call shares a
+    # byte-identical prefix; per-chunk markers go in the user turn.
     partials = []
     for i, ch in enumerate(chunks):
-        prompt = f"{base_instr}\n\n[CHUNK {i+1}/{len(chunks)}]\n\n{ch[:100000]}"
-        partials.append(text_chat(prompt))
+        prompt = f"[CHUNK {i+1}/{len(chunks)}]\n\n{ch[:100000]}"
+        partials.append(text_chat(prompt, system=base_instr))
 
     combined = "\n\n".join(partials)
-    prompt = f"{base_instr}\n\nCombine these partial summaries into one authoritative summary and bullets.\n\n{combined}"
-    final = text_chat(prompt)
+    prompt = f"Combine these partial summaries into one authoritative summary and bullets.\n\n{combined}"
+    final = text_chat(prompt, system=base_instr)
 
     # Critic pass
-    critic_prompt = CRITIC_PROMPT.read_text() + f"\n\nSUMMARY:\n{final}\n\nPARTIALS:\n{combined}"
+    critic_prompt = _load_prompt(CRITIC_PROMPT) + f"\n\nSUMMARY:\n{final}\n\nPARTIALS:\n{combined}"
     critic = json_chat(critic_prompt, schema_hint="CriticReport")
     quality_score = float(critic.get("quality_score", 0.8))
     flags = critic.get("flags", [])
     issues = critic.get("issues", [])
 
     # Extract tasks JSON
-    tprompt = TASKS_PROMPT.read_text() + f"\n\nSUMMARY_AND_BULLETS:\n{final}"
+    tprompt = _load_prompt(TASKS_PROMPT) + f"\n\nSUMMARY_AND_BULLETS:\n{final}"
     extracted = json_chat(tprompt, schema_hint="ExtractedTasks")
     et = ExtractedTasks.model_validate(extracted)
 
@@ -128,19 +146,15 @@ def summarize_conversation(neo: Neo4jClient, conversation_id: str):
 
     # Ground bullets to transcript spans and link as EVIDENCE
     joined = "".join(texts)
-    offsets = []
-    total = 0
-    for uid, txt in utts:
-        offsets.append((uid, total, total+len(txt)))
-        total += len(txt)
+    # starts[i] is the char offset of utterance i in ``joined``; bisect finds
+    # the containing utterance per evidence in O(log U) instead of a scan.
+    # accumulate() keeps the prefix sums in C rather than a Python loop.
+    starts = [0, *itertools.accumulate(map(len, texts))]
     evidences = []
     grounded = ground_bullets(summary.get("bullets", []), joined)
     for ev in grounded:
-        usel = None
-        for uid, a, b in offsets:
-            if a <= ev["char_start"] < b:
-                usel = uid
-                break
+        idx = bisect.bisect_right(starts, ev["char_start"]) - 1
+        usel = uids[idx] if 0 <= idx < len(uids) else None
         if usel:
             ev_rec = {**ev, "utterance_id": usel}
             evidences.append(ev_rec)
@@ -148,9 +162,17 @@ def summarize_conversation(neo: Neo4jClient, conversation_id: str):
         neo.add_evidence(sid, evidences)
     logger.info(f"Summarized {conversation_id}: {len(tasks)} tasks (status=REVIEW), grounded {len(evidences)} evidences")
 
-def summarize_since_days(neo: Neo4jClient, days: int = 7):
+def summarize_since_days(neo: Neo4jClient, days: int = 7, enqueue: bool = False):
     with neo.driver.session() as s:
         res = s.run("MATCH (c:Conversation) WHERE coalesce(c.created_at,0) > timestamp() - $ms RETURN c.id", {"ms": days * 86400000})
         ids = [r[0] for r in res]
+    if enqueue:
+        # Fan out one RQ job per conversation so workers summarize in parallel.
+        from .jobs import summarize_conversation_job
+        from .queue import bulk_enqueue
+        bulk_enqueue(summarize_conversation_job, [(cid,) for cid in ids])
+        logger.info(f"Enqueued {len(ids)} conversation summaries")
+        return ids
     for cid in ids:
         summarize_conversation(neo, cid)
+    return ids
@@ -2,14 +2,19 @@
 from __future__ import annotations
 import os
 
-from .deps import load_queue_class, load_redis_module
+from .deps import load_queue_class, load_redis_module, redis_url
 
 Queue = load_queue_class()
 Redis = load_redis_module()
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
-
 def get_q() -> Queue:
-    r = Redis.from_url(REDIS_URL)
+    r = Redis.from_url(redis_url())
     job_timeout = int(os.getenv("RQ_JOB_TIMEOUT_S", "1800"))
     return Queue("assistx", connection=r, default_timeout=job_timeout)
+
+def bulk_enqueue(func, args_list, q: Queue | None = None) -> list:
+    """Enqueue ``func`` once per args tuple, in a single Redis pipeline when RQ supports it."""
+    q = q or get_q()
+    if hasattr(q, "enqueue_many") and hasattr(Queue, "prepare_data"):
+        return q.enqueue_many([Queue.prepare_data(func, args=tuple(a)) for a in args_list])
+    return [q.enqueue(func, *a) for a in args_list]
@@ -1,25 +1,23 @@
 from __future__ import annotations
 
-import os
 import time
 import logging
 import uuid
 from typing import Optional
 
-from .deps import load_redis_module
+from .deps import load_redis_module, redis_url
 
 redis_module = load_redis_module()
 
 logger = logging.getLogger(__name__)
 
-REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
 _r: Optional[redis_module.Redis] = None
 
 
 def _get_redis() -> redis_module.Redis:
     global _r
     if _r is None:
-        _r = redis_module.from_url(REDIS_URL)
+        _r = redis_module.from_url(redis_url())
     return _r
 
 
@@ -8,6 +8,7 @@ from typing import Any, Callable
 from fastapi import APIRouter, Query, Request
 
 from .coordination_metadata import build_task_candidate_metadata
+from .deps import redis_url
 
 
 def build_router_integration_router(neo_factory: Callable[[], Any]) -> APIRouter:
@@ -128,7 +129,7 @@ def _graph_summary(neo_factory: Callable[[], Any]) -> dict[str, Any]:
 
 
 def _node_projection(base_url: str, graph: dict[str, Any]) -> list[dict[str, Any]]:
-    redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    redis_uri = redis_url()
     neo4j_uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
     paperclip_url = os.getenv("PAPERCLIP_API_URL", "http://host.docker.internal:3100/api")
     return [
@@ -165,7 +166,7 @@ def _node_projection(base_url: str, graph: dict[str, Any]) -> list[dict[str, Any
             "running": True,
             "capabilities": ["queue", "cache"],
             "detail": "AssistX Redis queue/cache",
-            "services": [_service("assistx.redis", "AssistX Redis", redis_url, "queue", node_id="assistx-redis")],
+            "services": [_service("assistx.redis", "AssistX Redis", redis_uri, "queue", node_id="assistx-redis")],
         },
         {
             "node_id": "paperclip",
@@ -269,7 +270,7 @@ def _merge_providers(static: list[dict[str, Any]], live: list[dict[str, Any]]) -
 
 def _service_projection(base_url: str) -> list[dict[str, Any]]:
     neo4j_uri = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
-    redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    redis_uri = redis_url()
     paperclip_url = os.getenv("PAPERCLIP_API_URL", "http://host.docker.internal:3100/api")
     return [
         _service("assistx.ui", "AssistX UI", base_url, "assistx_ui", health_url=f"{base_url}/health", priority=10, status="online"),
@@ -278,7 +279,7 @@ def _service_projection(base_url: str) -> list[dict[str, Any]]:
         _service("assistx.context", "AssistX Router Context Projection", f"{base_url}/api/router/context-projection", "context_projection", priority=13, status="online"),
         _service("assistx.backlog", "AssistX Backlog Candidates", f"{base_url}/api/router/backlog-candidates", "backlog_candidates", priority=14, status="online"),
         _service("assistx.neo4j.bolt", "AssistX Neo4j Bolt", neo4j_uri, "graph_db", priority=30),
-        _service("assistx.redis", "AssistX Redis", redis_url, "queue", priority=40),
+        _service("assistx.redis", "AssistX Redis", redis_uri, "queue", priority=40),
         _service("paperclip.api", "Paperclip API", paperclip_url, "agent_control", priority=50),
     ]
 
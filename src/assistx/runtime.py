@@ -7,7 +7,7 @@ from typing import Any, Dict, List
 
 import requests
 
-from .deps import dependency_mode
+from .deps import dependency_mode, redis_url
 from . import __version__
 
 _start_time = time.time()
@@ -151,8 +151,8 @@ def _check_redis() -> Dict[str, Any]:
         from .deps import load_redis_module
 
         redis_module = load_redis_module()
-        redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
-        client = redis_module.from_url(redis_url, decode_responses=True)
+        url = redis_url()
+        client = redis_module.from_url(url, decode_responses=True)
         try:
             ping = client.ping()
         finally:
@@ -160,10 +160,10 @@ def _check_redis() -> Dict[str, Any]:
             if callable(close):
                 close()
         if ping is False:
-            return {"status": "down", "url": redis_url, "reason": "ping returned false"}
-        return {"status": "ok", "url": redis_url}
+            return {"status": "down", "url": url, "reason": "ping returned false"}
+        return {"status": "ok", "url": url}
     except Exception as exc:
-        return {"status": "down", "url": os.getenv("REDIS_URL", "redis://redis:6379/0"), "reason": str(exc)[:500]}
+        return {"status": "down", "url": redis_url(), "reason": str(exc)[:500]}
 
 
 def _check_neo4j() -> Dict[str, Any]:
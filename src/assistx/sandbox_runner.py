@@ -17,6 +17,30 @@ def safe_import(name, globals=None, locals=None, fromlist=(), level=0):
         raise ImportError(f"Import not allowed: {name}")
     return __import__(name, globals, locals, fromlist, level)
 
+def _no_open(*args, **kwargs): raise PermissionError("file I/O disabled")
+
+# Built once at import; each sandbox run is its own process, so sharing is safe.
+_SAFE = {**SAFE_BUILTINS, "__import__": safe_import, "open": _no_open}
+
+try:
+    import orjson
+
+    def _loads(raw: bytes):
+        return orjson.loads(raw)
+
+    def _dumps(obj) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. ints wider than 64 bits; stdlib json handles those
+            return json.dumps(obj, ensure_ascii=False)
+except ModuleNotFoundError:  # pragma: no cover - stdlib fallback
+    def _loads(raw: bytes):
+        return json.loads(raw)
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
 def limit_resources():
     # CPU time & address space
     cpu = int(TIMEOUT_S) + 1
@@ -31,7 +55,7 @@ def limit_resources():
 
 def main():
     # read payload from stdin
-    payload = json.loads(sys.stdin.read())
+    payload = _loads(sys.stdin.buffer.read())
     code = payload["code"]
     rows = payload["rows"]
 
@@ -50,11 +74,7 @@ def main():
         pd = _PandasShim()
 
     # sandbox env
-    g = {"__builtins__": SAFE_BUILTINS.copy()}
-    g["__builtins__"]["__import__"] = safe_import
-    # disable open
-    def _no_open(*args, **kwargs): raise PermissionError("file I/O disabled")
-    g["__builtins__"]["open"] = _no_open
+    g = {"__builtins__": _SAFE}
 
     # disable direct network access from executed code
     def _no_socket(*args, **kwargs): raise PermissionError("network disabled")
@@ -71,7 +91,7 @@ def main():
             raise RuntimeError("No main(rows) found")
         result = l["main"](rows)
 
-    print(json.dumps({"result": result, "stdout": out.getvalue()}, ensure_ascii=False))
+    print(_dumps({"result": result, "stdout": out.getvalue()}))
 
 if __name__ == "__main__":
     main()
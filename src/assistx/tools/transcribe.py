@@ -1,60 +1,219 @@
 
-import argparse, logging, os, json, uuid, time, pathlib
-from typing import List, Dict, Any
-from faster_whisper import WhisperModel
+import argparse
+import functools
+import json
+import logging
+import os
+import pathlib
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib fallback
+    orjson = None
+from faster_whisper import WhisperModel, decode_audio
+
+try:
+    from faster_whisper import BatchedInferencePipeline
+except ImportError:  # faster-whisper < 1.1 has no batched pipeline
+    BatchedInferencePipeline = None
 
 logger = logging.getLogger(__name__)
 
 AUDIO_EXTS = {'.wav', '.mp3', '.m4a', '.flac', '.ogg', '.opus'}
 
 def find_audio(root: str) -> List[pathlib.Path]:
-    p = pathlib.Path(root)
-    return [q for q in p.rglob("*") if q.suffix.lower() in AUDIO_EXTS]
+    # Iterative scandir walk: only matching files become Path objects
+    out: List[pathlib.Path] = []
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTS:
+                    out.append(pathlib.Path(entry.path))
+    return out
+
+def default_compute_type() -> str:
+    """int8_float16 on CUDA (INT8 weights, FP16 activations), plain int8 on CPU."""
+    try:
+        import ctranslate2
+        if ctranslate2.get_cuda_device_count() > 0:
+            return "int8_float16"
+    except Exception:
+        pass
+    return "int8"
+
+def load_model(name: str, compute_type: str | None = None, batch_size: int = 1):
+    """Load a WhisperModel, wrapped in a BatchedInferencePipeline when batching is requested and available."""
+    model = WhisperModel(name, device="auto", compute_type=compute_type or default_compute_type())
+    if batch_size > 1:
+        if BatchedInferencePipeline is not None:
+            return BatchedInferencePipeline(model=model)
+        logger.warning("batched inference needs faster-whisper>=1.1; transcribing serially")
+    return model
+
+def get_model(name: str | None = None, compute_type: str | None = None, batch_size: int = 1):
+    """Process-wide cached model handle, so repeated jobs in one worker skip the weight load."""
+    return _cached_model(name or os.getenv("WHISPER_MODEL", "tiny"), compute_type or default_compute_type(), max(1, batch_size))
+
+@functools.lru_cache(maxsize=4)
+def _cached_model(name: str, compute_type: str, batch_size: int):
+    return load_model(name, compute_type, batch_size)
+
+VAD_PARAMETERS = {"min_silence_duration_ms": 500}
+
+MODEL_CHOICES = ["tiny", "base", "small", "distil-small.en", "distil-medium.en", "distil-large-v3"]
+
+def model_language(name: str) -> str | None:
+    """distil-* and *.en checkpoints are English-only; pin the language so detection is skipped."""
+    return "en" if name.startswith("distil-") or name.endswith(".en") else None
+
+def iter_segments(model, path: pathlib.Path, batch_size: int = 1, audio=None, vad: bool = True,
+                  language: str | None = None, timestamps: bool = True):
+    """Yield segment dicts for ``path`` as the model decodes them.
 
-def transcribe_file(model: WhisperModel, path: pathlib.Path) -> Dict[str, Any]:
-    segments, info = model.transcribe(str(path), beam_size=1)
-    segs = []
+    Pass pre-decoded 16 kHz float32 ``audio`` to skip decoding here. With ``vad``
+    on, silence is dropped before decoding so Whisper doesn't pad and decode
+    empty 30 s windows; segment times stay relative to the original audio.
+    With ``timestamps`` off the decoder skips timestamp tokens, so segments
+    only carry window-level times; use it when only the text is consumed.
+    Conditioning on previous text is always off: it is what lets one
+    hallucinated window trigger temperature-fallback retries on the next.
+    """
+    kwargs: Dict[str, Any] = {"beam_size": 1, "condition_on_previous_text": False}
+    if not timestamps:
+        kwargs["without_timestamps"] = True
+    if language:
+        kwargs["language"] = language
+    if vad:
+        kwargs["vad_filter"] = True
+        kwargs["vad_parameters"] = VAD_PARAMETERS
+    if BatchedInferencePipeline is not None and isinstance(model, BatchedInferencePipeline):
+        kwargs["batch_size"] = batch_size
+    segments, info = model.transcribe(audio if audio is not None else str(path), **kwargs)
     for i, seg in enumerate(segments):
-        segs.append({
+        yield {
             "id": f"{path.stem}_{i}",
             "idx": i,
             "start": round(seg.start, 3),
             "end": round(seg.end, 3),
             "text": seg.text.strip(),
             "tokens_count": None
-        })
-    txt = "\n".join(s["text"] for s in segs)
+        }
+
+def transcribe_file(model, path: pathlib.Path, batch_size: int = 1, audio=None, vad: bool = True,
+                    language: str | None = None, timestamps: bool = True) -> Dict[str, Any]:
+    """Transcribe ``path`` into one in-memory transcription dict."""
+    segs = list(iter_segments(model, path, batch_size=batch_size, audio=audio, vad=vad,
+                              language=language, timestamps=timestamps))
     return {
         "id": uuid.uuid4().hex,
         "key": path.stem,
-        "text": txt,
+        "text": "\n".join(s["text"] for s in segs),
         "source_json": None,
         "source_rttm": None,
         "segments": segs
     }
 
+def _dumps(obj: Any) -> bytes:
+    """Two-space indented JSON, the on-disk transcript format."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+def _nested(obj: Any) -> bytes:
+    """``obj`` indented as an element of the top-level ``segments`` list."""
+    return b"    " + _dumps(obj).replace(b"\n", b"\n    ")
+
+def stream_transcription(model, path: pathlib.Path, out_root: pathlib.Path, batch_size: int = 1,
+                         audio=None, vad: bool = True, language: str | None = None,
+                         timestamps: bool = True) -> Dict[str, Any]:
+    """Transcribe ``path`` straight to ``<stem>_transcription.json``/``.txt`` under ``out_root``.
+
+    Segments are serialized as the model yields them, so the full segment list
+    is never held in memory; only the text parts are kept for the TXT file.
+    Returns the transcription header with a segment count instead of the segments.
+    """
+    json_path = out_root / f"{path.stem}_transcription.json"
+    head = {
+        "id": uuid.uuid4().hex,
+        "key": path.stem,
+        "source_json": str(json_path.resolve()),
+        "source_rttm": None,
+    }
+    text_parts: List[str] = []
+    # Stream into a sibling temp file so a failed decode never leaves a
+    # truncated transcript at the final path
+    tmp_path = json_path.with_name(json_path.name + ".tmp")
+    try:
+        with tmp_path.open("wb") as f:
+            f.write(_dumps(head)[:-2] + b',\n  "segments": [')
+            for seg in iter_segments(model, path, batch_size=batch_size, audio=audio, vad=vad,
+                                     language=language, timestamps=timestamps):
+                f.write(b",\n" if text_parts else b"\n")
+                f.write(_nested(seg))
+                text_parts.append(seg["text"])
+            text = "\n".join(text_parts)
+            f.write((b"\n  ]" if text_parts else b"]") + b',\n  "text": ' + _dumps(text) + b"\n}\n")
+        os.replace(tmp_path, json_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    (out_root / f"{path.stem}_transcription.txt").write_text(text, encoding="utf-8")
+    return {**head, "segments": len(text_parts)}
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--audio-root", required=True)
     ap.add_argument("--out-root", required=True, help="Where to write transcription JSON and TXT")
-    ap.add_argument("--model", default="tiny", choices=["tiny","base"])
+    ap.add_argument("--model", default="tiny", choices=MODEL_CHOICES,
+                    help="distil-* models are English-only; on CUDA pair distil-large-v3 with --compute-type int8_float16")
+    ap.add_argument("--compute-type", default=None, help="CTranslate2 compute type (default: int8_float16 on CUDA, int8 on CPU)")
+    ap.add_argument("--batch-size", type=int, default=1,
+                    help="Batched inference size (needs faster-whisper>=1.1; the pinned 1.0.2 transcribes serially)")
+    ap.add_argument("--vad", action=argparse.BooleanOptionalAction, default=True, help="Skip silence with the Silero VAD filter")
+    ap.add_argument("--timestamps", action=argparse.BooleanOptionalAction, default=True,
+                    help="Decode segment timestamps; --no-timestamps is faster when only text is needed")
+    ap.add_argument("--enqueue", action="store_true",
+                    help="Queue one transcribe_job per file for the RQ workers instead of transcribing here")
     args = ap.parse_args()
 
     os.makedirs(args.out_root, exist_ok=True)
-    model = WhisperModel(args.model, device="auto", compute_type="int8")
     files = find_audio(args.audio_root)
     if not files:
         logger.warning("No audio found."); return
     logger.info("Found %d audio files", len(files))
+    if args.enqueue:
+        from ..jobs import transcribe_job
+        from ..queue import bulk_enqueue
+        bulk_enqueue(transcribe_job, [(str(f), args.out_root, args.model, args.batch_size) for f in files])
+        logger.info("Enqueued %d transcribe jobs", len(files))
+        return
+    model = get_model(args.model, args.compute_type, args.batch_size)
 
-    for f in files:
-        t0 = time.time()
-        obj = transcribe_file(model, f)
-        obj["source_json"] = str((pathlib.Path(args.out_root) / f"{f.stem}_transcription.json").resolve())
-        # write json + txt
-        (pathlib.Path(args.out_root) / f"{f.stem}_transcription.json").write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
-        (pathlib.Path(args.out_root) / f"{f.stem}_transcription.txt").write_text(obj["text"], encoding="utf-8")
-        logger.info("%s: %d segments in %.1fs", f.name, len(obj['segments']), time.time() - t0)
+    # Overlap CPU-side work with the model: one thread decodes the next file's
+    # audio while the current one transcribes and streams to disk.
+    # The model call stays on this thread (CTranslate2 releases the GIL).
+    out_root = pathlib.Path(args.out_root)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-decode") as decoder:
+        pending = decoder.submit(decode_audio, str(files[0]))
+        for i, f in enumerate(files):
+            audio = pending.result()
+            if i + 1 < len(files):
+                pending = decoder.submit(decode_audio, str(files[i + 1]))
+            t0 = time.time()
+            obj = stream_transcription(model, f, out_root, batch_size=args.batch_size, audio=audio, vad=args.vad,
+                                       language=model_language(args.model), timestamps=args.timestamps)
+            logger.info("%s: %d segments in %.1fs", f.name, obj['segments'], time.time() - t0)
 
 if __name__ == "__main__":
     main()
@@ -8,6 +8,7 @@ import signal
 import socket
 import threading
 import time
+from collections import deque
 
 # Dump all thread stacks on SIGUSR1 for debugging wedged workers.
 faulthandler.enable()
@@ -21,7 +22,7 @@ except (ValueError, OSError):
     pass
 
 from .config import settings
-from .deps import load_redis_module, use_compat_shims
+from .deps import load_redis_module, redis_url, use_compat_shims
 from .runtime import validate_runtime_configuration
 
 logger = logging.getLogger(__name__)
@@ -29,17 +30,165 @@ logger = logging.getLogger(__name__)
 redis = load_redis_module()
 if use_compat_shims():
     try:
-        from rq import Worker, Queue, Connection
+        from rq import Worker, Queue, SimpleWorker
     except ModuleNotFoundError:
         from .compat import InMemoryQueue as Queue
-        Worker = Connection = None
+        Worker = SimpleWorker = None
 else:
-    from rq import Worker, Queue, Connection
+    from rq import Worker, Queue
     from rq import SimpleWorker
 
 HEALTH_PORT = int(os.getenv("WORKER_HEALTH_PORT", "8100"))
 
 
+def _pubsub_error(exc, pubsub, thread) -> None:
+    """Keep the control-channel listener alive across idle socket timeouts.
+
+    RQ sets a finite ``socket_timeout`` on the connection, so a fully blocking
+    read raises ``TimeoutError`` after a quiet spell; that is not an error.
+    """
+    from redis.exceptions import TimeoutError as RedisTimeoutError
+
+    if isinstance(exc, RedisTimeoutError):
+        return
+    logger.warning("worker pubsub listener error: %s", exc)
+    time.sleep(1.0)  # pubsub reconnects and resubscribes on the next read
+
+
+if SimpleWorker is not None:
+
+    class BlockingPubSubWorker(SimpleWorker):
+        """SimpleWorker whose control-channel thread blocks instead of polling.
+
+        Stock RQ wakes the pubsub thread every 0.2s to look for stop-job and
+        shutdown commands. Here it sleeps in a blocking read until Redis pushes
+        a frame; on teardown our own UNSUBSCRIBE reply wakes it exactly once.
+        """
+
+        def subscribe(self):
+            self.log.info("Subscribing to channel %s", self.pubsub_channel_name)
+            self.pubsub = self.connection.pubsub()
+            self.pubsub.subscribe(**{self.pubsub_channel_name: self.handle_payload})
+            self.pubsub_thread = self.pubsub.run_in_thread(
+                sleep_time=None, daemon=True, exception_handler=_pubsub_error
+            )
+
+        def unsubscribe(self):
+            if self.pubsub_thread:
+                self.log.info("Unsubscribing from channel %s", self.pubsub_channel_name)
+                self.pubsub_thread.stop()
+                self.pubsub.unsubscribe(self.pubsub_channel_name)
+                self.pubsub_thread.join(timeout=1)
+                self.pubsub.close()
+
+    class BatchWorker(BlockingPubSubWorker):
+        """Pull up to ``prefetch`` jobs per Redis round trip.
+
+        The first job still arrives through RQ's blocking dequeue; once one is
+        in hand, up to ``prefetch - 1`` more ids are LMOVEd (Redis >= 6.2) in
+        one pipeline into this worker's processing list and their hashes
+        fetched in one more. Later dequeues pop from the local deque until it
+        drains, dropping each id from the processing list as it is handed to
+        RQ. Teardown moves unstarted ids back to the front of the queue; if the
+        worker dies without one (SIGKILL, OOM, node loss), any live worker's
+        maintenance pass requeues them once the dead worker's key expires, so a
+        prefetched job may run twice but is not lost.
+        """
+
+        def __init__(self, *args, prefetch: int = 1, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.prefetch = max(1, prefetch)
+            self._prefetched = deque()
+
+        def _processing_key(self, queue, name=None) -> str:
+            return f"{queue.key}:prefetched:{self.name if name is None else name}"
+
+        def dequeue_job_and_maintain_ttl(self, timeout, max_idle_time=None):
+            if self._prefetched:
+                self.heartbeat()
+                job, queue = self._prefetched.popleft()
+                self.connection.lrem(self._processing_key(queue), 1, job.id)
+                self.log.info("%s: %s (prefetched)", queue.name, job.id)
+                return job, queue
+            result = super().dequeue_job_and_maintain_ttl(timeout, max_idle_time)
+            if result is not None and self.prefetch > 1:
+                self._fill(result[1])
+            return result
+
+        def _fill(self, queue) -> None:
+            from redis.exceptions import ResponseError
+            from rq.utils import as_text
+
+            processing = self._processing_key(queue)
+            pipe = self.connection.pipeline(transaction=False)
+            for _ in range(self.prefetch - 1):
+                pipe.lmove(queue.key, processing, "LEFT", "RIGHT")
+            try:
+                moved = pipe.execute()
+            except ResponseError as exc:
+                self.log.warning("LMOVE unavailable (%s); prefetch disabled", exc)
+                self.prefetch = 1
+                return
+            ids = [as_text(job_id) for job_id in moved if job_id is not None]
+            if not ids:
+                return
+            jobs = self.job_class.fetch_many(ids, connection=self.connection, serializer=self.serializer)
+            version = self.get_redis_server_version()
+            for job_id, job in zip(ids, jobs, strict=True):
+                if job is None:  # deleted while queued; dequeue_any skips these too
+                    self.connection.lrem(processing, 1, job_id)
+                    continue
+                job.redis_server_version = version
+                self._prefetched.append((job, queue))
+
+        def _requeue(self, queue, name=None) -> int:
+            """Move ids from a processing list back to the queue front, oldest first."""
+            processing = self._processing_key(queue, name)
+            n = 0
+            while self.connection.lmove(processing, queue.key, "RIGHT", "LEFT") is not None:
+                n += 1
+            return n
+
+        def run_maintenance_tasks(self):
+            super().run_maintenance_tasks()
+            from rq.utils import as_text
+
+            for queue in self.queues:
+                prefix = self._processing_key(queue, "")
+                for key in self.connection.scan_iter(match=f"{prefix}*"):
+                    owner = as_text(key)[len(prefix):]
+                    if owner == self.name or self.connection.exists(self.redis_worker_namespace_prefix + owner):
+                        continue
+                    n = self._requeue(queue, owner)
+                    if n:
+                        self.log.warning("requeued %d job(s) prefetched by dead worker %s", n, owner)
+
+        def teardown(self):
+            self._prefetched.clear()
+            for queue in self.queues:
+                self._requeue(queue)
+            super().teardown()
+
+def _redis_options(url: str) -> dict:
+    """TCP keepalive + periodic health checks so idle blocking pops survive NAT/firewall idle timeouts."""
+    if use_compat_shims():
+        return {}
+    if url.startswith("unix://"):
+        # No NAT on a local socket, and Unix connections reject the keepalive kwargs
+        return {"health_check_interval": 30, "retry_on_timeout": True}
+    keepalive = {
+        getattr(socket, name): value
+        for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3))
+        if hasattr(socket, name)
+    }
+    return {
+        "socket_keepalive": True,
+        "socket_keepalive_options": keepalive,
+        "health_check_interval": 30,
+        "retry_on_timeout": True,
+    }
+
+
 def _worker_name(index: int) -> str:
     hostname = socket.gethostname().split(".", 1)[0].replace("_", "-")
     pid = os.getpid()
@@ -74,7 +223,7 @@ def _health_server() -> None:
 
 
 def _run_one_worker(index: int, listen: list[str], redis_url: str) -> None:
-    conn = redis.from_url(redis_url)
+    conn = redis.from_url(redis_url, **_redis_options(redis_url))
     worker_name = _worker_name(index)
     # Agent loops (decide + tool calls + retries) can run well past RQ's
     # default 180s. We raise the default timeout on the Queue instance so jobs
@@ -89,18 +238,45 @@ def _run_one_worker(index: int, listen: list[str], redis_url: str) -> None:
         from .agents.orchestrator import run_task  # noqa: F401
     except Exception as exc:  # pragma: no cover
         logger.warning("child warmup import failed: %s", exc)
-    with Connection(conn):
-        queues = [Queue(name, default_timeout=job_timeout) for name in listen]
-        # Use SimpleWorker: runs jobs in-process without forking a horse.
-        # The default Worker forks, and forking after background threads were
-        # started deadlocks the child on Python's import lock (classic
-        # fork-after-thread). SimpleWorker reuses the already-imported modules
-        # in the worker process, eliminating that deadlock.
-        # with_scheduler=False: RQ's scheduler spawns a background thread that
-        # imports concurrently and races on the import lock; we don't need the
-        # scheduler (the drainer enqueues directly).
-        w = SimpleWorker(queues, name=worker_name)
-        w.work(with_scheduler=False)
+    # Load Whisper weights once per worker process (after fork, so the CUDA
+    # context belongs to this child); transcribe_job reuses the cached handle.
+    if os.getenv("WHISPER_PRELOAD", "0") == "1":
+        try:
+            from .tools.transcribe import get_model
+            get_model()
+        except Exception as exc:  # pragma: no cover
+            logger.warning("whisper preload failed: %s", exc)
+    # Idle workers sit in a single blocking pop (BLMOVE for one queue on Redis
+    # >= 6.2, else BLPOP) of worker_ttl - 15 seconds between heartbeats; RQ
+    # refuses an infinite timeout. Redis hands an enqueued job to a blocked
+    # popper as part of the producer's push, so no separate arrival
+    # notification (pub/sub) can wake a worker sooner; a longer TTL only means
+    # fewer idle wakeups.
+    worker_ttl = int(os.getenv("RQ_WORKER_TTL", "420"))
+    # Jobs report through Neo4j and nothing reads RQ results back, so by default
+    # a finished job is deleted instead of saved to a result stream and the
+    # finished registry. Failures keep RQ's failure_ttl for inspection.
+    result_ttl = int(os.getenv("RQ_RESULT_TTL", "0"))
+    queues = [Queue(name, connection=conn, default_timeout=job_timeout) for name in listen]
+    # Use SimpleWorker: runs jobs in-process without forking a horse.
+    # The default Worker forks, and forking after background threads were
+    # started deadlocks the child on Python's import lock (classic
+    # fork-after-thread). SimpleWorker reuses the already-imported modules
+    # in the worker process, eliminating that deadlock.
+    # RQ_PREFETCH>1 opts into batch dequeue; default stays one job per pop.
+    prefetch = int(os.getenv("RQ_PREFETCH", "1"))
+    if prefetch > 1:
+        w = BatchWorker(queues, name=worker_name, connection=conn, default_worker_ttl=worker_ttl,
+                        default_result_ttl=result_ttl, prefetch=prefetch)
+    else:
+        w = BlockingPubSubWorker(queues, name=worker_name, connection=conn, default_worker_ttl=worker_ttl,
+                                 default_result_ttl=result_ttl)
+    # The scheduler stays off by default: RQ forks it from this (threaded)
+    # process, the same fork-after-thread hazard as above. enqueue_in jobs
+    # (maintenance, model prober) only run when RQ_WITH_SCHEDULER=1; one worker
+    # is enough since RQ lets a single scheduler hold the queue lock.
+    with_scheduler = index == 1 and os.getenv("RQ_WITH_SCHEDULER", "0") == "1"
+    w.work(with_scheduler=with_scheduler, logging_level=os.getenv("RQ_LOG_LEVEL", "INFO"))
 
 
 def _start_execution_pollers() -> list[threading.Thread]:
@@ -178,6 +354,9 @@ def main():
             "assistx.fleet",
             "assistx.outbox_client",
             "assistx.neo4j_client",
+            # faster_whisper/ctranslate2 imports only; weights (and any CUDA
+            # context) load per child via WHISPER_PRELOAD after the fork.
+            "assistx.tools.transcribe",
             "prometheus_client",
             "prometheus_client.exposition",
             "prometheus_client.registry",
@@ -196,19 +375,19 @@ def main():
         logger.warning("parent warmup failed: %s", exc)
     _start_execution_pollers()
     listen = [os.getenv("RQ_QUEUE", "assistx")]
-    redis_url = os.getenv("REDIS_URL", "redis://redis:6379/0")
+    url = redis_url()
     concurrency = max(1, int(os.getenv("WORKER_CONCURRENCY", "1")))
 
     t = threading.Thread(target=_health_server, daemon=True)
     t.start()
 
     if concurrency == 1:
-        _run_one_worker(1, listen, redis_url)
+        _run_one_worker(1, listen, url)
         return
 
     processes: list[mp.Process] = []
     for i in range(concurrency):
-        p = mp.Process(target=_run_one_worker, args=(i + 1, listen, redis_url), daemon=False)
+        p = mp.Process(target=_run_one_worker, args=(i + 1, listen, url), daemon=False)
         p.start()
         processes.append(p)
 
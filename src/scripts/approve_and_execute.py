@@ -21,19 +21,37 @@ Acceptance types:
 Run manifest_json contains steps, acceptance_results, timings (as JSON string).
 """
 
-import os, sys, json, re, time, argparse, uuid, pathlib, datetime
+import atexit, functools, mmap, os, sys, json, re, time, argparse, uuid, pathlib, datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 import requests
 from neo4j import GraphDatabase
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib fallback
+    orjson = None
 
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "neo4j")
 ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "./artifacts")
+# Literal `contains` checks on artifacts at least this big search a read-only
+# mmap for the UTF-8 bytes instead of decoding the whole file to str.
+MMAP_MIN_BYTES = int(os.getenv("ACCEPTANCE_MMAP_MIN_BYTES", str(1 << 20)))
+
+def _dumps(obj: Any) -> str:
+    """Compact JSON string for Neo4j properties (UTF-8, no ASCII escaping)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False)
 
 # ---------- Neo helpers ----------
+@functools.lru_cache(maxsize=1)
 def neo():
-    return GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    """One driver (and connection pool) per process, closed at exit."""
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    atexit.register(driver.close)
+    return driver
 
 def q_list(session, status: str, limit: int = 25) -> List[Dict[str, Any]]:
     res = session.run(
@@ -101,88 +119,174 @@ def q_pick_ready(session, limit: int) -> List[Dict[str, Any]]:
     )
     return [r["id"] for r in res]
 
-def q_attach_run(session, task_id: str, run: Dict[str, Any]):
-    # Store complex structures as JSON strings
+def q_get_tasks(session, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Batched q_get_task: one round trip for all ids, keyed by task id."""
     res = session.run(
         """
-        MATCH (task:Task {id:$tid})
+        MATCH (task:Task) WHERE task.id IN $ids
+        OPTIONAL MATCH (s:Summary)-[:GENERATED_TASK]->(task)
+        OPTIONAL MATCH (t:Transcription)-[:HAS_SUMMARY]->(s)
+        RETURN task, s, t
+        """,
+        ids=ids,
+    )
+    out: Dict[str, Dict[str, Any]] = {}
+    for rec in res:
+        task = dict(rec["task"])
+        out.setdefault(task["id"], {
+            "task": task,
+            "summary": dict(rec["s"]) if rec["s"] else None,
+            "transcription": dict(rec["t"]) if rec["t"] else None,
+        })
+    return out
+
+def _utcnow() -> datetime.datetime:
+    # tz-aware datetimes go over Bolt as native temporals; no datetime() parse in Cypher
+    return datetime.datetime.now(datetime.UTC)
+
+def q_attach_runs(session, runs: List[Dict[str, Any]]) -> None:
+    # Store complex structures as JSON strings
+    session.run(
+        """
+        UNWIND $runs AS run
+        MATCH (task:Task {id:run.tid})
         CREATE (r:Run {
-          id: $rid,
-          started_at: datetime($started_at),
-          status: $status,
-          manifest_json: $manifest_json
+          id: run.rid,
+          started_at: run.started_at,
+          status: run.status,
+          manifest_json: run.manifest_json
         })
         MERGE (task)-[:HAS_RUN]->(r)
-        RETURN r.id AS rid
         """,
-        tid=task_id,
-        rid=run["id"],
-        started_at=run["started_at"],
-        status=run["status"],
-        manifest_json=json.dumps(run.get("manifest", {}), ensure_ascii=False),
-    ).single()
-    return res["rid"]
+        runs=[
+            {
+                "tid": run["manifest"]["task_id"],
+                "rid": run["id"],
+                "started_at": run["started_at"],
+                "status": run["status"],
+                "manifest_json": _dumps(run.get("manifest", {})),
+            }
+            for run in runs
+        ],
+    ).consume()
 
-def q_finish_run(session, task_id: str, run_id: str, success: bool, manifest: Dict[str, Any]):
+def q_finish_runs(session, finished: List[Dict[str, Any]]) -> None:
+    """``finished`` items: {tid, rid, success, manifest}."""
+    ended_at = _utcnow()
     session.run(
         """
-        MATCH (task:Task {id:$tid})-[:HAS_RUN]->(r:Run {id:$rid})
-        SET r.status = $rstatus,
-            r.ended_at = datetime($ended_at),
-            r.success = $success,
-            r.manifest_json = $manifest_json,
-            task.status = $tstatus,
+        UNWIND $runs AS run
+        MATCH (task:Task {id:run.tid})-[:HAS_RUN]->(r:Run {id:run.rid})
+        SET r.status = run.status,
+            r.ended_at = run.ended_at,
+            r.success = run.success,
+            r.manifest_json = run.manifest_json,
+            task.status = run.status,
             task.updated_at = datetime()
         """,
-        tid=task_id,
-        rid=run_id,
-        rstatus = "DONE" if success else "FAILED",
-        tstatus = "DONE" if success else "FAILED",
-        ended_at = datetime.datetime.utcnow().isoformat() + "Z",
-        success = success,
-        manifest_json = json.dumps(manifest, ensure_ascii=False),
-    )
+        runs=[
+            {
+                "tid": f["tid"],
+                "rid": f["rid"],
+                "status": "DONE" if f["success"] else "FAILED",
+                "ended_at": ended_at,
+                "success": f["success"],
+                "manifest_json": _dumps(f["manifest"]),
+            }
+            for f in finished
+        ],
+    ).consume()
+
+# ---------- HTTP ----------
+# ``http`` maps url -> Response (or the exception raised). cmd_execute makes one
+# per invocation so execution and the http_ok acceptance check share a single
+# GET per URL without serving stale results to later runs.
+
+def _http_get(url: str):
+    try:
+        return requests.get(url, timeout=10)
+    except Exception as e:
+        return e
+
+def prefetch_http(urls: List[str], http: Dict[str, Any]) -> None:
+    """Fetch all URLs not yet in ``http`` concurrently."""
+    todo = [u for u in dict.fromkeys(urls) if u and u not in http]
+    if not todo:
+        return
+    with ThreadPoolExecutor(max_workers=min(len(todo), 8)) as pool:
+        for url, res in zip(todo, pool.map(_http_get, todo), strict=True):
+            http[url] = res
+
+def http_get_cached(url: str, http: Optional[Dict[str, Any]] = None):
+    if http is None:
+        return _http_get(url)
+    if url not in http:
+        http[url] = _http_get(url)
+    return http[url]
+
+def http_ok_urls(task: Dict[str, Any]) -> List[str]:
+    return [a["args"]["url"] for a in (task.get("acceptance") or [])
+            if a.get("type") == "http_ok" and a.get("args",{}).get("url")]
 
 # ---------- Acceptance ----------
 def replace_placeholders(s: str, task_id: str) -> str:
     return (s or "").replace("{TASK_ID}", task_id)
 
-def acc_file_exists(args: Dict[str, Any], task_id: str) -> (bool, str):
+def _resolve_path(args: Dict[str, Any], task_id: str) -> str:
     path = replace_placeholders(args.get("path",""), task_id)
-    path = path.replace("artifacts/", f"{ARTIFACTS_DIR.rstrip('/')}/")
+    return path.replace("artifacts/", f"{ARTIFACTS_DIR.rstrip('/')}/")
+
+def _read_text(path: str, files: Optional[Dict[str, str]]) -> str:
+    """Read and decode ``path`` once per acceptance run; ``files`` memoizes across rules."""
+    if files is not None and path in files:
+        return files[path]
+    text = pathlib.Path(path).read_text(encoding="utf-8", errors="ignore")
+    if files is not None:
+        files[path] = text
+    return text
+
+@functools.lru_cache(maxsize=128)
+def _compile(pat: str) -> "re.Pattern[str]":
+    return re.compile(pat)
+
+def acc_file_exists(args: Dict[str, Any], task_id: str, files: Optional[Dict[str, str]] = None, http: Optional[Dict[str, Any]] = None) -> (bool, str):
+    path = _resolve_path(args, task_id)
     ok = pathlib.Path(path).exists()
     return ok, f"path={path}"
 
-def acc_contains(args: Dict[str, Any], task_id: str) -> (bool, str):
-    path = replace_placeholders(args.get("path",""), task_id)
-    path = path.replace("artifacts/", f"{ARTIFACTS_DIR.rstrip('/')}/")
+def acc_contains(args: Dict[str, Any], task_id: str, files: Optional[Dict[str, str]] = None, http: Optional[Dict[str, Any]] = None) -> (bool, str):
+    path = _resolve_path(args, task_id)
     text = args.get("text","")
     try:
-        data = pathlib.Path(path).read_text(encoding="utf-8", errors="ignore")
+        if files is None or path not in files:
+            size = os.path.getsize(path)
+            if size >= MMAP_MIN_BYTES:
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    ok = mm.find(text.encode("utf-8")) != -1
+                return ok, f"path={path} bytes={size}"
+        data = _read_text(path, files)
         ok = text in data
         return ok, f"path={path} len={len(data)}"
     except Exception as e:
         return False, f"path={path} err={e}"
 
-def acc_regex(args: Dict[str, Any], task_id: str) -> (bool, str):
-    path = replace_placeholders(args.get("path",""), task_id)
-    path = path.replace("artifacts/", f"{ARTIFACTS_DIR.rstrip('/')}/")
+def acc_regex(args: Dict[str, Any], task_id: str, files: Optional[Dict[str, str]] = None, http: Optional[Dict[str, Any]] = None) -> (bool, str):
+    path = _resolve_path(args, task_id)
     pat = args.get("pattern","")
     try:
-        data = pathlib.Path(path).read_text(encoding="utf-8", errors="ignore")
-        ok = re.search(pat, data) is not None
+        data = _read_text(path, files)
+        ok = _compile(pat).search(data) is not None
         return ok, f"path={path} pat={pat}"
     except Exception as e:
         return False, f"path={path} err={e}"
 
-def acc_http_ok(args: Dict[str, Any], _task_id: str) -> (bool, str):
+def acc_http_ok(args: Dict[str, Any], _task_id: str, files: Optional[Dict[str, str]] = None, http: Optional[Dict[str, Any]] = None) -> (bool, str):
     url = args.get("url","")
-    try:
-        r = requests.get(url, timeout=10)
-        ok = 200 <= r.status_code < 300
-        return ok, f"url={url} code={r.status_code}"
-    except Exception as e:
-        return False, f"url={url} err={e}"
+    r = http_get_cached(url, http)
+    if isinstance(r, Exception):
+        return False, f"url={url} err={r}"
+    ok = 200 <= r.status_code < 300
+    return ok, f"url={url} code={r.status_code}"
 
 ACCEPTANCE_FUNCS = {
     "file_exists": acc_file_exists,
@@ -191,16 +295,27 @@ ACCEPTANCE_FUNCS = {
     "http_ok": acc_http_ok,
 }
 
-def run_acceptance(task: Dict[str, Any], task_id: str) -> List[Dict[str, Any]]:
-    results = []
-    acc_list = task.get("acceptance") or []
-    for i, a in enumerate(acc_list):
+def compile_acceptance(task: Dict[str, Any]) -> List[tuple]:
+    """Resolve the task's acceptance rules to ``(index, type, check)``.
+
+    ``check`` is the rule function with its args bound (None for unknown types).
+    Built per run from the task as fetched, so edited rules are never stale.
+    """
+    checks = []
+    for i, a in enumerate(task.get("acceptance") or []):
         typ = (a.get("type") or "").strip()
         f = ACCEPTANCE_FUNCS.get(typ)
-        if not f:
+        checks.append((i, typ, functools.partial(f, a.get("args", {})) if f else None))
+    return checks
+
+def run_acceptance(task: Dict[str, Any], task_id: str, http: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    results = []
+    files: Dict[str, str] = {}  # shared by rules that read the same artifact
+    for i, typ, check in compile_acceptance(task):
+        if check is None:
             results.append({"index": i, "type": typ, "passed": False, "detail": "unknown acceptance type"})
             continue
-        ok, detail = f(a.get("args", {}), task_id)
+        ok, detail = check(task_id, files, http)
         results.append({"index": i, "type": typ, "passed": bool(ok), "detail": detail})
     return results
 
@@ -210,7 +325,15 @@ def ensure_artifacts(task_id: str) -> pathlib.Path:
     p.mkdir(parents=True, exist_ok=True)
     return p
 
-def execute_task_minimal(task: Dict[str, Any]) -> Dict[str, Any]:
+def _write_bytes(path: pathlib.Path, data: bytes) -> int:
+    """Single open/write/close in binary mode, skipping the text-layer wrapper."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        return os.write(fd, data)
+    finally:
+        os.close(fd)
+
+def execute_task_minimal(task: Dict[str, Any], http: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Minimal, safe "execution":
       - make artifacts/{TASK_ID}
@@ -231,21 +354,26 @@ TITLE: {task.get('title','')}
 DESC: {task.get('description','')}
 TIME: {datetime.datetime.utcnow().isoformat()}Z
 """
-    out_path.write_text(content, encoding="utf-8")
+    _write_bytes(out_path, content.encode("utf-8"))
     steps.append({"op":"write_file","path":str(out_path),"bytes":len(content)})
 
     # Optional: if acceptance has http_ok, fetch once and save headers/body snippet
-    for a in (task.get("acceptance") or []):
-        if a.get("type") == "http_ok" and a.get("args",{}).get("url"):
-            url = a["args"]["url"]
-            try:
-                r = requests.get(url, timeout=10)
-                (artdir / "http.status").write_text(str(r.status_code), encoding="utf-8")
-                body_snip = (r.text or "")[:4096]
-                (artdir / "http.body.txt").write_text(body_snip, encoding="utf-8")
-                steps.append({"op":"http_get","url":url,"status":r.status_code,"bytes":len(r.content)})
-            except Exception as e:
-                steps.append({"op":"http_get","url":url,"error":str(e)})
+    urls = http_ok_urls(task)
+    if http is None:
+        http = {}
+    prefetch_http(urls, http)
+    for url in urls:
+        r = http_get_cached(url, http)
+        if isinstance(r, Exception):
+            steps.append({"op":"http_get","url":url,"error":str(r)})
+            continue
+        try:
+            _write_bytes(artdir / "http.status", str(r.status_code).encode())
+            body_snip = (r.text or "")[:4096]
+            _write_bytes(artdir / "http.body.txt", body_snip.encode("utf-8"))
+            steps.append({"op":"http_get","url":url,"status":r.status_code,"bytes":len(r.content)})
+        except Exception as e:
+            steps.append({"op":"http_get","url":url,"error":str(e)})
 
     # Return manifest
     return {
@@ -285,40 +413,54 @@ def cmd_accept(args):
     print("PASS" if passed else "FAIL")
 
 def cmd_execute(args):
-    picked = []
     with neo().session() as s:
         picked = q_pick_ready(s, limit=args.limit)
-    if not picked:
-        print("No READY tasks."); return
+        if not picked:
+            print("No READY tasks."); return
 
-    for tid in picked:
-        with neo().session() as s:
-            row = q_get_task(s, tid)
-            if not row:
+        rows = q_get_tasks(s, picked)
+        runs = []
+        for tid in picked:
+            if tid not in rows:
                 print(f"{tid}: missing"); continue
-            task = row["task"]
-
-            run = {
+            runs.append({
                 "id": str(uuid.uuid4()),
-                "started_at": datetime.datetime.utcnow().isoformat()+"Z",
+                "started_at": _utcnow(),
                 "status": "RUNNING",
                 "manifest": {"task_id": tid, "steps": [], "acceptance_results": []},
-            }
-            q_attach_run(s, tid, run)
-
-        # Execute outside transaction
-        manifest_exec = execute_task_minimal(task)
-        results = run_acceptance(task, tid)
-        success = all(r["passed"] for r in results) if results else True  # if no acceptance, treat as success
-
-        # finalize
-        run["manifest"].update(manifest_exec)
-        run["manifest"]["acceptance_results"] = results
-
-        with neo().session() as s:
-            q_finish_run(s, tid, run["id"], success, run["manifest"])
-
-        print(f"{tid}: {'DONE' if success else 'FAILED'}  artifacts={manifest_exec['artifacts_dir']}")
+            })
+        if not runs:
+            return
+        q_attach_runs(s, runs)
+        # Fetch every http_ok URL across the batch up front, concurrently
+        http: Dict[str, Any] = {}
+        prefetch_http([u for run in runs for u in http_ok_urls(rows[run["manifest"]["task_id"]]["task"])], http)
+
+        # Execute outside any transaction, then finalize all runs in one write;
+        # the finally still records what finished if the loop itself dies
+        finished = []
+        try:
+            for run in runs:
+                tid = run["manifest"]["task_id"]
+                task = rows[tid]["task"]
+                try:
+                    manifest_exec = execute_task_minimal(task, http)
+                    results = run_acceptance(task, tid, http)
+                except Exception as e:
+                    run["manifest"]["error"] = f"{type(e).__name__}: {e}"
+                    finished.append({"tid": tid, "rid": run["id"], "success": False, "manifest": run["manifest"]})
+                    print(f"{tid}: FAILED  error={run['manifest']['error']}")
+                    continue
+                success = all(r["passed"] for r in results) if results else True  # if no acceptance, treat as success
+
+                run["manifest"].update(manifest_exec)
+                run["manifest"]["acceptance_results"] = results
+                finished.append({"tid": tid, "rid": run["id"], "success": success, "manifest": run["manifest"]})
+
+                print(f"{tid}: {'DONE' if success else 'FAILED'}  artifacts={manifest_exec['artifacts_dir']}")
+        finally:
+            if finished:
+                q_finish_runs(s, finished)
 
 def build_cli():
     ap = argparse.ArgumentParser(description="Approve and execute tasks using local FS + Neo4j.")
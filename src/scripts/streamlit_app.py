@@ -1,5 +1,6 @@
 # streamlit_app.py
 import os, requests, streamlit as st
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
 API = os.getenv("ASSISTX_API", "http://localhost:8000")
@@ -7,6 +8,29 @@ USER = os.getenv("BASIC_AUTH_USER", "admin")
 PASS = os.getenv("BASIC_AUTH_PASS", "change-me")
 AUTH = HTTPBasicAuth(USER, PASS)
 
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Keep-alive session shared across reruns so API calls reuse pooled connections."""
+    s = requests.Session()
+    s.auth = AUTH
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    return s
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def fetch_transcriptions(q, limit):
+    r = get_session().get(f"{API}/api/transcriptions", params={"q": q or None, "limit": limit})
+    return r.json() if r.ok else {"items": []}
+
+
+@st.cache_data(ttl=15, show_spinner=False)
+def fetch_tasks(status, limit):
+    r = get_session().get(f"{API}/api/tasks", params={"status": (status or None), "limit": limit})
+    return r.json().get("items", []) if r.ok else []
+
 st.set_page_config(page_title="AssistX", layout="wide")
 st.title("AssistX Control Panel")
 
@@ -14,26 +38,28 @@ st.title("AssistX Control Panel")
 st.header("Adsk (async)")
 q = st.text_area("Question", "")
 if st.button("Ask"):
-    r = requests.post(f"{API}/api/ask_async", json={"question": q}, auth=AUTH)
+    r = get_session().post(f"{API}/api/ask_async", json={"question": q})
     st.session_state["last_answer_id"] = r.json()["answer_id"]
     st.success(r.json())
 
 ans_id = st.session_state.get("last_answer_id")
 if ans_id and st.button("Refresh status"):
-    r = requests.get(f"{API}/api/answers/{ans_id}", auth=AUTH)
+    r = get_session().get(f"{API}/api/answers/{ans_id}")
     st.write(r.json())
 
 tab1, tab2 = st.tabs(["Transcriptions", "Tasks"])
 
 with tab1:
-    c1, c2 = st.columns([2,1])
+    c1, c2, c3 = st.columns([2,1,1])
     with c1:
         q = st.text_input("Search (contains)", "")
     with c2:
         limit = st.slider("Limit", 5, 200, 50, 5)
+    with c3:
+        if st.button("Refresh", key="refresh_tr"):
+            fetch_transcriptions.clear()
 
-    r = requests.get(f"{API}/api/transcriptions", params={"q": q or None, "limit": limit}, auth=AUTH)
-    data = r.json() if r.ok else {"items": []}
+    data = fetch_transcriptions(q, limit)
     st.caption(f"{data.get('count', 0)} result(s)")
     for tr in data.get("items", []):
         with st.expander(f"{tr.get('key','(no-key)')} · {tr.get('id')}"):
@@ -41,45 +67,50 @@ with tab1:
             ttitle = st.text_input(f"Task title for {tr['id']}", f"Summarize: {tr.get('key','transcription')}", key=f"ttl_{tr['id']}")
             cols = st.columns(3)
             if cols[0].button("Create Task (REVIEW)", key=f"crt_{tr['id']}"):
-                resp = requests.post(
+                resp = get_session().post(
                     f"{API}/api/transcriptions/{tr['id']}/task",
-                    json={"title": ttitle, "status": "REVIEW", "kind": "transcription_summary"},
-                    auth=AUTH
+                    json={"title": ttitle, "status": "REVIEW", "kind": "transcription_summary"}
                 )
+                fetch_tasks.clear()
                 st.success(resp.json())
             if cols[1].button("Create Task (READY)", key=f"crt_r_{tr['id']}"):
-                resp = requests.post(
+                resp = get_session().post(
                     f"{API}/api/transcriptions/{tr['id']}/task",
-                    json={"title": ttitle, "status": "READY", "kind": "transcription_summary"},
-                    auth=AUTH
+                    json={"title": ttitle, "status": "READY", "kind": "transcription_summary"}
                 )
+                fetch_tasks.clear()
                 st.success(resp.json())
             if cols[2].button("Embed (spawn task)", key=f"emb_{tr['id']}"):
-                resp = requests.post(f"{API}/api/transcriptions/{tr['id']}/embed", auth=AUTH)
+                resp = get_session().post(f"{API}/api/transcriptions/{tr['id']}/embed")
                 st.info(resp.json())
 
 with tab2:
-    c1, c2, c3 = st.columns([1,1,1])
+    c1, c2, c3, c4 = st.columns([1,1,1,1])
     with c1:
         status = st.selectbox("Status", ["", "READY", "REVIEW", "RUNNING", "DONE", "FAILED"], index=0)
     with c2:
         limit2 = st.slider("Limit", 5, 200, 50, 5, key="lim2")
     with c3:
         run_now = st.checkbox("Enqueue READY on click", value=False)
+    with c4:
+        if st.button("Refresh", key="refresh_tasks"):
+            fetch_tasks.clear()
 
-    r = requests.get(f"{API}/api/tasks", params={"status": (status or None), "limit": limit2}, auth=AUTH)
-    tasks = r.json().get("items", []) if r.ok else []
+    tasks = fetch_tasks(status, limit2)
     for t in tasks:
         with st.expander(f"{t.get('title','(no-title)')} · {t['id']} · {t.get('status')}"):
             st.json(t)
             cols = st.columns(3)
             if cols[0].button("Details", key=f"det_{t['id']}"):
-                d = requests.get(f"{API}/api/tasks/{t['id']}", auth=AUTH).json()
+                d = get_session().get(f"{API}/api/tasks/{t['id']}").json()
                 st.code(d, language="json")
             if cols[1].button("Enqueue", key=f"enq_{t['id']}"):
-                r2 = requests.post(f"{API}/tasks/{t['id']}/enqueue", params={"dry_run": False}, auth=AUTH)
+                r2 = get_session().post(f"{API}/tasks/{t['id']}/enqueue", params={"dry_run": False})
+                fetch_tasks.clear()
                 st.success(r2.json())
             if cols[2].button("Mark READY", key=f"mrd_{t['id']}"):
                 # quick status toggle using existing endpoint
-                r3 = requests.post(f"{API}/tasks/{t['id']}/approve", auth=AUTH)
-                if r3.ok: st.success("Task set to READY")
+                r3 = get_session().post(f"{API}/tasks/{t['id']}/approve")
+                if r3.ok:
+                    fetch_tasks.clear()
+                    st.success("Task set to READY")
@@ -4,7 +4,9 @@ Summarize from SEGMENTs (UTTERANCE optional) → Summary + Tasks in Neo4j,
 with model-based routing, approve & execute, and local-first Ollama.
 
 Routing
-- Summarizer model chosen by transcript length (small/medium/large).
+- Summarizer model chosen by transcript token count (small/medium/large).
+- Transcripts under the medium threshold skip the summarizer: the reasoner
+  returns summary + tasks in one call (--two-pass to disable).
 - Reasoner/coder model chosen by task type:
   * requirements  → tiny/fast reasoning
   * mvp_design    → coder-small/medium
@@ -20,6 +22,14 @@ Env
   NEO4J_PASSWORD=<pwd>
   OLLAMA_HOST=http://localhost:11434
   ARTIFACTS_DIR=./artifacts
+  OLLAMA_NUM_PARALLEL=4 (concurrent requests; match the Ollama server setting)
+  SUMMARIZE_WORKERS=4 (transcriptions in flight with --all-missing; default OLLAMA_NUM_PARALLEL)
+  SUMMARY_CTX=4096 (context for every Ollama call, raised to fit --token-threshold-medium; chunks get half)
+  LOG_BUFFER_LINES=256 (output lines buffered before a write when stdout is not a terminal)
+  OLLAMA_KEEP_ALIVE=30m (keep routed models and their prompt cache resident; 24h pins them)
+  EMBED_MODEL=nomic-embed-text, SEMCACHE_THRESHOLD=0.97 (--semantic-cache)
+  SEMCACHE_MAX_ROWS=5000 (oldest semantic-cache entries are evicted past this)
+  PREFER_QUANT     (optional, e.g. q4_K_M; same as --prefer-quant)
   SUMMARIZER_MODEL (optional explicit override)
   REASONER_MODEL   (optional explicit override)
 
@@ -35,10 +45,47 @@ Examples
   python summarize_from_segments.py --latest \
     --model-summarizer gemma2:2b --model-reasoner qwen2.5-coder:0.5b
 """
-import os, json, argparse, time, re, uuid, datetime, pathlib
+import atexit, functools, logging, logging.handlers, math, os, sys, json, argparse, random, sqlite3, threading, time, re, uuid, datetime, pathlib
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Iterable
 import requests
+from requests.adapters import HTTPAdapter
 from neo4j import GraphDatabase
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - stdlib fallback
+    orjson = None
+try:
+    import tiktoken
+except ModuleNotFoundError:  # pragma: no cover - chars/4 estimate instead
+    tiktoken = None
+try:
+    import numpy as np
+except ModuleNotFoundError:  # pragma: no cover - pure-Python similarity fallback
+    np = None
+
+logger = logging.getLogger("summarize")
+
+def setup_logging() -> None:
+    """Progress lines go to stdout through a line buffer flushed every 256
+    records (each record when stdout is a terminal), on errors, and at exit,
+    so long batch runs don't pay a write per line into a docker log pipe."""
+    target = logging.StreamHandler(sys.stdout)
+    target.setFormatter(logging.Formatter("%(message)s"))
+    capacity = 1 if sys.stdout.isatty() else int(os.getenv("LOG_BUFFER_LINES", "256"))
+    handler = logging.handlers.MemoryHandler(capacity, flushLevel=logging.ERROR, target=target)
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    atexit.register(handler.flush)
+
+def emit(text: str) -> None:
+    """Print user-facing output (dry-run JSON, --list rows) to stdout, after any
+    buffered log lines so the order matches; it never depends on setup_logging()."""
+    for h in logger.handlers:
+        h.flush()
+    print(text)
 
 # ============== Env & Defaults ==============
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
@@ -46,6 +93,45 @@ NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "neo4j")
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 ARTIFACTS_DIR = os.getenv("ARTIFACTS_DIR", "./artifacts")
+OLLAMA_NUM_PARALLEL = max(1, int(os.getenv("OLLAMA_NUM_PARALLEL", "4")))
+SUMMARIZE_WORKERS = max(1, int(os.getenv("SUMMARIZE_WORKERS", str(OLLAMA_NUM_PARALLEL))))
+# Transcription workers and their chunk-map pools share these slots, so the
+# server never sees more than OLLAMA_NUM_PARALLEL generations at once.
+_OLLAMA_SLOTS = threading.BoundedSemaphore(OLLAMA_NUM_PARALLEL)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
+SEMCACHE_THRESHOLD = float(os.getenv("SEMCACHE_THRESHOLD", "0.97"))
+SEMCACHE_MAX_ROWS = int(os.getenv("SEMCACHE_MAX_ROWS", "5000"))
+
+def _dumps(obj: Any) -> str:
+    """Compact JSON string (UTF-8, no ASCII escaping); orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, ensure_ascii=False)
+
+def _loads(s: str | bytes) -> Any:
+    return orjson.loads(s) if orjson is not None else json.loads(s)
+
+# One keep-alive pool for Ollama and acceptance/executor fetches
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=64, max_retries=0)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+atexit.register(SESSION.close)
+
+# Quantized builds tried ahead of each default tag when installed (Q4_K_M roughly
+# halves weight bandwidth, which is what bounds local decode speed).
+QUANT_VARIANTS: Dict[str, str] = {
+    "gemma2:2b": "gemma2:2b-instruct-q4_K_M",
+    "llama3:latest": "llama3:8b-instruct-q4_K_M",
+    "qwen2.5-coder:0.5b": "qwen2.5-coder:0.5b-instruct-q4_K_M",
+    "qwen2.5-coder:3b": "qwen2.5-coder:3b-instruct-q4_K_M",
+    "qwen3-coder:30b": "qwen3-coder:30b-a3b-q4_K_M",
+    "qwen3-coder:latest": "qwen3-coder:30b-a3b-q4_K_M",
+}
+# --prefer-quant / PREFER_QUANT: instead, take any installed "<tag>-...<quant>" build
+# (for a :latest tag, any "<name>:...<quant>" build of the same model name)
+PREFER_QUANT: Optional[str] = os.getenv("PREFER_QUANT") or None
 
 # Preferred model lists (ordered). These are *names* as shown by /api/tags.
 DEFAULT_SUMMARIZER_PREFS: list[str] = [
@@ -85,11 +171,26 @@ DEFAULT_REASONER_PREFS_CODER_LARGE: list[str] = [
     "llama3:latest",
 ]
 
-# Length routing thresholds (characters)
-DEFAULT_LEN_MEDIUM = int(os.getenv("LEN_THRESHOLD_MEDIUM", "8000"))
-DEFAULT_LEN_LARGE  = int(os.getenv("LEN_THRESHOLD_LARGE",  "30000"))
+# Length routing thresholds in cl100k_base tokens (tiktoken is in requirements.txt;
+# estimate_tokens only falls back to ~4 chars per token when its BPE file can't be
+# fetched). The older LEN_THRESHOLD_* / --len-threshold-* settings counted
+# characters; they are still read, at ~4 chars per token.
+def _chars_as_tokens(value: str) -> int:
+    return int(value) // 4
+
+def _token_threshold(name: str, legacy: str, default: int) -> int:
+    if os.getenv(name):
+        return int(os.environ[name])
+    if os.getenv(legacy):
+        return _chars_as_tokens(os.environ[legacy])
+    return default
+
+DEFAULT_TOK_MEDIUM = _token_threshold("TOKEN_THRESHOLD_MEDIUM", "LEN_THRESHOLD_MEDIUM", 2000)
+DEFAULT_TOK_LARGE  = _token_threshold("TOKEN_THRESHOLD_LARGE",  "LEN_THRESHOLD_LARGE",  7500)
 
 # ============== Prompts ==============
+# System prompts are sent byte-identical and first in every request so Ollama
+# can reuse the prefilled prefix; don't format per-call data into them.
 SUMMARIZE_INSTR = """You are given a conversation transcript composed of time-ordered items.
 Rules:
 - Treat SEGMENT items as authoritative.
@@ -131,78 +232,156 @@ Guidelines:
 - IMPORTANT: ACCEPTANCE IS REQUIRED WHENEVER POSSIBLE. Prefer outputs under artifacts/{TASK_ID}/output.txt to enable verification.
 Return ONLY JSON (no prose)."""
 
+# Short transcripts get summary, bullets and tasks from one reasoner call.
+COMBINED_INSTR = """You are given a conversation transcript composed of time-ordered items.
+Rules:
+- Treat SEGMENT items as authoritative.
+- Items marked LOW_CONF (from UTTERANCE) are lower confidence; only use them if consistent with SEGMENT content.
+- Output must be faithful, concise, and specific. Avoid speculation.
+
+Summarize it and extract ACTION ITEMS in a single JSON object:
+""" + TASKS_INSTR.split("\n\n", 1)[1]
+
 # ============== Neo4j helpers ==============
+@functools.lru_cache(maxsize=1)
 def neo_driver():
-    return GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    """One driver (and connection pool) per process, closed at exit."""
+    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD),
+                                  max_connection_pool_size=32, connection_acquisition_timeout=30)
+    atexit.register(driver.close)
+    return driver
+
+# Same uniqueness constraints AssistX's ensure_schema creates (each is backed by
+# an index), plus the status/updated_at indexes the approve/execute queries scan.
+SCHEMA_STATEMENTS = [
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (tr:Transcription) REQUIRE tr.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (s:Summary) REQUIRE s.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (t:Task) REQUIRE t.id IS UNIQUE",
+    "CREATE CONSTRAINT IF NOT EXISTS FOR (r:Run) REQUIRE r.id IS UNIQUE",
+    "CREATE INDEX IF NOT EXISTS FOR (t:Task) ON (t.status)",
+    "CREATE INDEX IF NOT EXISTS FOR (t:Task) ON (t.updated_at)",
+]
 
-def fetch_one(session, trans_id: Optional[str], latest: bool) -> Optional[Dict[str, Any]]:
+def ensure_indexes(driver) -> None:
+    """Best-effort: a constraint blocked by existing duplicates is reported, not fatal."""
+    with driver.session() as s:
+        for stmt in SCHEMA_STATEMENTS:
+            try:
+                s.run(stmt).consume()
+            except Exception as e:
+                logger.info(f"[schema] skipped: {stmt} ({e})")
+
+# Per-transcription segment/utterance lists, each collected in time order in its
+# own subquery (no cross product between the two legs). Expects `t` in scope.
+_SEGS = """
+CALL {
+  WITH t
+  MATCH (t)-[:HAS_SEGMENT]->(s:Segment)
+  WITH s ORDER BY coalesce(s.start, s.idx, 0)
+  RETURN collect({id:s.id, start:coalesce(s.start,0.0), end:coalesce(s.end,0.0), text:s.text, type:'SEGMENT', low_conf:false}) AS segs
+}
+"""
+_UTTS = """
+CALL {
+  WITH t
+  MATCH (t)-[:HAS_UTTERANCE]->(u)
+  WITH u ORDER BY coalesce(u.start, u.idx, 0)
+  RETURN collect({id:u.id, start:coalesce(u.start,0.0), end:coalesce(u.end,0.0), text:u.text, type:'UTTERANCE', low_conf:true}) AS utts
+}
+"""
+
+def _segs_utts(include_utterances: bool) -> str:
+    # Without utterances the second leg is skipped server-side entirely
+    if include_utterances:
+        return _SEGS + _UTTS + "RETURN t, segs, utts"
+    return _SEGS + "RETURN t, segs, [] AS utts"
+
+def _row(rec) -> Dict[str, Any]:
+    t = dict(rec["t"])
+    segs = [x for x in (rec["segs"] or []) if x and x.get("text")]
+    utts = [x for x in (rec["utts"] or []) if x and x.get("text")]
+    return {"t": t, "segments": segs, "utterances": utts}
+
+def fetch_one(session, trans_id: Optional[str], latest: bool,
+              include_utterances: bool = True) -> Optional[Dict[str, Any]]:
     if trans_id:
-        q = """
-        MATCH (t:Transcription {id:$id})
-        OPTIONAL MATCH (t)-[:HAS_SEGMENT]->(s:Segment)
-        WITH t, s ORDER BY coalesce(s.start, s.idx, 0)
-        WITH t, collect({id:s.id, start:coalesce(s.start,0.0), end:coalesce(s.end,0.0), text:s.text, type:'SEGMENT', low_conf:false}) AS segs
-        OPTIONAL MATCH (t)-[:HAS_UTTERANCE]->(u)
-        WITH t, segs, u ORDER BY coalesce(u.start, u.idx, 0)
-        RETURN t, segs, collect({id:u.id, start:coalesce(u.start,0.0), end:coalesce(u.end,0.0), text:u.text, type:'UTTERANCE', low_conf:true}) AS utts
-        """
+        q = "MATCH (t:Transcription {id:$id})" + _segs_utts(include_utterances)
         rec = session.run(q, id=trans_id).single()
     else:
         q = """
         MATCH (t:Transcription)
         WITH t ORDER BY coalesce(t.created_at, datetime()) DESC
         LIMIT 1
-        OPTIONAL MATCH (t)-[:HAS_SEGMENT]->(s:Segment)
-        WITH t, s ORDER BY coalesce(s.start, s.idx, 0)
-        WITH t, collect({id:s.id, start:coalesce(s.start,0.0), end:coalesce(s.end,0.0), text:s.text, type:'SEGMENT', low_conf:false}) AS segs
-        OPTIONAL MATCH (t)-[:HAS_UTTERANCE]->(u)
-        WITH t, segs, u ORDER BY coalesce(u.start, u.idx, 0)
-        RETURN t, segs, collect({id:u.id, start:coalesce(u.start,0.0), end:coalesce(u.end,0.0), text:u.text, type:'UTTERANCE', low_conf:true}) AS utts
-        """
+        """ + _segs_utts(include_utterances)
         rec = session.run(q).single()
+    return _row(rec) if rec else None
+
+def fetch_many(session, ids: List[str], include_utterances: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Batch fetch_one: id -> {t, segments, utterances} in one round-trip."""
+    q = "UNWIND $ids AS tid MATCH (t:Transcription {id:tid})" + _segs_utts(include_utterances)
+    out: Dict[str, Dict[str, Any]] = {}
+    for rec in session.run(q, ids=list(ids)):
+        row = _row(rec)
+        out[row["t"].get("id")] = row
+    return out
+
+# Missing = no Summary yet, or (when notes will be written) empty notes. Runs
+# without --write-notes can't fill notes, so re-summarizing those rows would
+# only stack duplicate Summaries. Keyset-paginated newest-first on (ts, id);
+# rows lacking created_at sort last instead of re-stamping each page.
+_MISSING = """
+MATCH (t:Transcription)
+WHERE NOT EXISTS { (t)-[:HAS_SUMMARY]->(:Summary) }
+   OR ($need_notes AND trim(coalesce(t.notes, '')) = '')
+WITH t, coalesce(t.created_at, datetime({epochMillis: 0})) AS ts
+WHERE $after_ts IS NULL OR ts < $after_ts OR (ts = $after_ts AND t.id > $after_id)
+RETURN t, ts
+ORDER BY ts DESC, t.id
+LIMIT $limit
+"""
 
-    if not rec:
-        return None
-    t = dict(rec["t"])
-    segs = [x for x in (rec["segs"] or []) if x and x.get("text")]
-    utts = [x for x in (rec["utts"] or []) if x and x.get("text")]
-    return {"t": t, "segments": segs, "utterances": utts}
+def fetch_missing_transcriptions_paged(session, page: int = 200, after: Optional[tuple] = None,
+                                       need_notes: bool = True) -> tuple[List[Dict[str, Any]], Optional[tuple]]:
+    """One page of candidates plus the cursor for the next (None when exhausted)."""
+    after_ts, after_id = after or (None, None)
+    recs = list(session.run(_MISSING, limit=page, after_ts=after_ts, after_id=after_id,
+                            need_notes=need_notes))
+    rows = [dict(r["t"]) for r in recs]
+    if len(recs) < page:
+        return rows, None
+    return rows, (recs[-1]["ts"], rows[-1].get("id"))
 
-def fetch_missing_transcriptions(session, limit: int) -> List[Dict[str, Any]]:
-    q = """
-    MATCH (t:Transcription)
-    WHERE NOT (t)-[:HAS_SUMMARY]->(:Summary)
-       OR trim(coalesce(t.notes, '')) = ''
-    RETURN t
-    ORDER BY coalesce(t.created_at, datetime()) DESC
-    LIMIT $limit
-    """
-    return [dict(r["t"]) for r in session.run(q, limit=limit)]
+def fetch_missing_transcriptions(session, limit: int, need_notes: bool = True) -> List[Dict[str, Any]]:
+    return fetch_missing_transcriptions_paged(session, page=limit, need_notes=need_notes)[0]
 
 # ============== Transcript assembly ==============
 def build_transcript(segments: List[Dict[str,Any]], utterances: List[Dict[str,Any]], include_utterances: bool=False) -> str:
-    items = list(segments)
-    if include_utterances:
-        items += utterances
-    items.sort(key=lambda r: (float(r.get("start",0.0)), float(r.get("end",0.0))))
-    lines = []
-    for it in items:
-        txt = (it.get("text") or "").strip()
-        if not txt:
-            continue
-        if it["type"] == "UTTERANCE":
-            lines.append(f"[LOW_CONF] {txt}")
-        else:
-            lines.append(txt)
+    if include_utterances and utterances:
+        items = sorted(segments + utterances, key=lambda r: (float(r.get("start",0.0)), float(r.get("end",0.0))))
+    else:
+        items = segments  # fetch_one/fetch_many already return segments in time order
+    lines = [
+        ("[LOW_CONF] " + txt) if it["type"] == "UTTERANCE" else txt
+        for it in items
+        if (txt := (it.get("text") or "").strip())
+    ]
     return "\n".join(lines)
 
 # ============== Model discovery & routing ==============
-def _post_ollama(endpoint: str, payload: dict, timeout: int = 180):
-    return requests.post(f"{OLLAMA_HOST}{endpoint}", json=payload, timeout=timeout)
+def _post_ollama(endpoint: str, payload: dict, timeout: int = 180, stream: bool = False):
+    return SESSION.post(f"{OLLAMA_HOST}{endpoint}", json=payload, timeout=timeout, stream=stream)
 
 def installed_models() -> set[str]:
+    """Installed tags from /api/tags, cached per minute."""
+    return set(_installed_models_cached(int(time.time() // 60)))
+
+@functools.lru_cache(maxsize=1)
+def _installed_models_cached(_bucket: int) -> frozenset[str]:
+    return frozenset(_installed_models_impl())
+
+def _installed_models_impl() -> set[str]:
     try:
-        r = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=10)
+        r = SESSION.get(f"{OLLAMA_HOST}/api/tags", timeout=10)
         r.raise_for_status()
         data = r.json()
         names = {m.get("name") or m.get("model") for m in data.get("models", [])}
@@ -210,55 +389,91 @@ def installed_models() -> set[str]:
     except Exception:
         return set()
 
+def _quant_candidates(tag: str, installed: set[str]) -> List[str]:
+    if PREFER_QUANT:
+        q = PREFER_QUANT.lower()
+        name, _, size = tag.partition(":")
+        if size != "latest":
+            base = tag + "-"
+        elif tag in QUANT_VARIANTS:
+            base = QUANT_VARIANTS[tag].rsplit("-", 1)[0] + "-"
+        else:
+            # Any quant build of the same model name; never a sibling like qwen2.5 for qwen2.5-coder
+            base = name + ":"
+        return sorted(t for t in installed if t.startswith(base) and q in t.partition(":")[2].lower())
+    variant = QUANT_VARIANTS.get(tag)
+    return [variant] if variant else []
+
 def pick_model(prefs: Iterable[Optional[str]], installed: set[str]) -> str:
     for tag in [p for p in prefs if p]:
-        if tag in installed:
-            return tag
+        for cand in (*_quant_candidates(tag, installed), tag):
+            if cand in installed:
+                return cand
     for tag in prefs:
         if tag:
             return tag
     return "llama3:latest"
 
-def estimate_len(text: str) -> int:
-    return len(text or "")
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    # get_encoding downloads the BPE file on first use; offline hosts fall back
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
 
-def route_summarizer(text_len: int, installed: set[str], explicit: Optional[str],
-                     len_medium: int, len_large: int) -> str:
+def estimate_tokens(text: str) -> int:
+    """cl100k_base token count when tiktoken is installed, else ~4 chars per token."""
+    if not text:
+        return 0
+    enc = _encoding()
+    if enc is None:
+        return (len(text) + 3) // 4
+    return len(enc.encode(text, disallowed_special=()))
+
+def route_summarizer(n_tokens: int, installed: set[str], explicit: Optional[str],
+                     tok_medium: int, tok_large: int) -> str:
     if explicit:
         return explicit
-    if text_len < len_medium:
+    if n_tokens < tok_medium:
         prefs = [None, "gemma2:2b", "llama3:latest", "qwen3-coder:30b"]
-    elif text_len < len_large:
+    elif n_tokens < tok_large:
         prefs = [None, "llama3:latest", "gemma2:2b", "qwen3-coder:30b"]
     else:
         prefs = [None, "qwen3-coder:30b", "llama3:latest", "gemma2:2b"]
     return pick_model(prefs, installed)
 
+# All category keywords in one alternation; group order is the priority order
+_CATEGORY_RE = re.compile(
+    r"\b(?:"
+    r"(?P<requirements>requirements?|spec|acceptance criteria|user stories|story points|backlog)"
+    r"|(?P<mvp_design>mvp|prototype|design doc|architecture|uml|erd|schema|interface design|api design)"
+    r"|(?P<coding_build>implement|build|code|refactor|unit tests?|integration tests?|library|sdk|cli|service|microservice|module)"
+    r"|(?P<ops_deploy>deploy|docker|compose|kubernetes|helm|ci/cd|pipeline|release|prod|staging|infra|observability|monitoring|prometheus|grafana)"
+    r")\b",
+    re.IGNORECASE,
+)
+_CATEGORY_RANK = {name: i for i, name in enumerate(_CATEGORY_RE.groupindex)}
+
 def classify_task_category(summary_obj: Dict[str,Any]) -> str:
     """
     Heuristic task-type classifier from summary+bullets.
     Returns one of: requirements, mvp_design, coding_build, ops_deploy, research
     """
-    text = (summary_obj.get("summary","") + " " + " ".join(summary_obj.get("bullets",[]))).lower()
-
-    # requirements
-    if re.search(r"\b(requirements?|spec|acceptance criteria|user stories|story points|backlog)\b", text):
-        return "requirements"
-
-    # mvp/design
-    if re.search(r"\b(mvp|prototype|design doc|architecture|uml|erd|schema|interface design|api design)\b", text):
-        return "mvp_design"
-
-    # coding/build
-    if re.search(r"\b(implement|build|code|refactor|unit tests?|integration tests?|library|sdk|cli|service|microservice|module)\b", text):
-        return "coding_build"
-
-    # deploy/ops
-    if re.search(r"\b(deploy|docker|compose|kubernetes|helm|ci/cd|pipeline|release|prod|staging|infra|observability|monitoring|prometheus|grafana)\b", text):
-        return "ops_deploy"
-
-    # research / misc
-    return "research"
+    text = summary_obj.get("summary","") + " " + " ".join(summary_obj.get("bullets",[]))
+
+    # Single scan; the highest-priority category seen wins (requirements > mvp_design
+    # > coding_build > ops_deploy), falling back to research
+    best = None
+    for m in _CATEGORY_RE.finditer(text):
+        cat = m.lastgroup
+        if best is None or _CATEGORY_RANK[cat] < _CATEGORY_RANK[best]:
+            best = cat
+            if _CATEGORY_RANK[cat] == 0:
+                break
+    return best or "research"
 
 def route_reasoner(category: str, installed: set[str], explicit: Optional[str]) -> str:
     if explicit:
@@ -275,10 +490,38 @@ def route_reasoner(category: str, installed: set[str], explicit: Optional[str])
         prefs = DEFAULT_REASONER_PREFS_GENERAL
     return pick_model(prefs, installed)
 
+TASK_CATEGORIES = (*_CATEGORY_RANK, "research")
+
+def run_models(installed: set[str], explicit_summarizer: Optional[str], explicit_reasoner: Optional[str],
+               tok_medium: int, tok_large: int) -> List[str]:
+    """Every installed tag this run can route to (summarizers first), deduplicated."""
+    tags = [route_summarizer(n, installed, explicit_summarizer, tok_medium, tok_large)
+            for n in (0, tok_medium, tok_large)]
+    tags += [route_reasoner(c, installed, explicit_reasoner) for c in TASK_CATEGORIES]
+    return [t for t in dict.fromkeys(tags) if t in installed]
+
+def prewarm_models(models: Iterable[str]) -> None:
+    """Load each model once up front (empty generate) so routing switches mid-batch
+    don't stall on a cold load; keep_alive keeps them resident for the run.
+
+    Loads at NUM_CTX, the context every real call requests: Ollama restarts a
+    runner whose num_ctx changes, so warming at any other size would just be
+    reloaded by the first real call.
+    """
+    for m in models:
+        t0 = time.time()
+        try:
+            _post_ollama("/api/generate", {"model": m, "prompt": "", "stream": False,
+                                           "options": {"num_ctx": NUM_CTX},
+                                           "keep_alive": OLLAMA_KEEP_ALIVE}, timeout=600).raise_for_status()
+            logger.info(f"[prewarm] {m} loaded in {time.time() - t0:.1f}s")
+        except Exception as e:
+            logger.info(f"[prewarm] {m} skipped ({e})")
+
 # ============== Robust Ollama JSON ==============
 def ollama_chat_json(model: str, system: str, user: str, temperature: float = 0.2) -> Dict[str, Any]:
     """
-    1) Try /api/chat (non-streaming, format=json). If 404, use /api/generate.
+    1) Try /api/chat (streaming, format=json). If 404, use /api/generate.
     2) Handle NDJSON or code-fenced JSON.
     """
     chat_payload = {
@@ -287,66 +530,67 @@ def ollama_chat_json(model: str, system: str, user: str, temperature: float = 0.
             {"role": "system", "content": system},
             {"role": "user", "content": user}
         ],
-        "options": {"temperature": temperature, "num_ctx": 8192},
+        "options": {"temperature": temperature, "num_ctx": NUM_CTX},
         "format": "json",
-        "stream": False,
+        "stream": True,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
     }
     try:
-        r = _post_ollama("/api/chat", chat_payload)
-        if r.status_code == 404:
-            raise RuntimeError("chat endpoint not found (404)")
-        r.raise_for_status()
-        try:
-            body = r.json()
-            content = body.get("message", {}).get("content", "")
-            obj = _coerce_json_dict(content)
-            if obj:
-                return obj
-        except Exception:
-            pass
-        return _coerce_json_dict(_stitch_ndjson(r.text))
+        with _OLLAMA_SLOTS:
+            return _coerce_json_dict(_stream_ollama("/api/chat", chat_payload))
     except Exception:
         gen_payload = {
             "model": model,
             "prompt": f"{system}\n\n{user}",
-            "options": {"temperature": temperature, "num_ctx": 8192},
+            "options": {"temperature": temperature, "num_ctx": NUM_CTX},
             "format": "json",
-            "stream": False,
+            "stream": True,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
         }
-        r = _post_ollama("/api/generate", gen_payload)
+        with _OLLAMA_SLOTS:
+            return _coerce_json_dict(_stream_ollama("/api/generate", gen_payload))
+
+def _stream_ollama(endpoint: str, payload: dict, timeout: int = 180) -> str:
+    """
+    Consume an NDJSON stream as it arrives, joining message.content (chat) or
+    response (generate) pieces until the final ``done`` line. Lines that
+    aren't JSON are kept verbatim so a non-streamed body still parses.
+    """
+    with _post_ollama(endpoint, payload, timeout=timeout, stream=True) as r:
+        if r.status_code == 404:
+            raise RuntimeError(f"{endpoint} not found (404)")
         r.raise_for_status()
-        try:
-            body = r.json()
-            content = body.get("response", "")
-            obj = _coerce_json_dict(content)
-            if obj:
-                return obj
-        except Exception:
-            pass
-        return _coerce_json_dict(_stitch_ndjson(r.text))
+        # application/x-ndjson carries no charset, and without an encoding
+        # iter_lines(decode_unicode=True) yields bytes
+        r.encoding = "utf-8"
+        pieces = []
+        for ln in r.iter_lines(decode_unicode=True):
+            if not ln or not ln.strip():
+                continue
+            try:
+                o = _loads(ln)
+            except ValueError:
+                pieces.append(ln)
+                continue
+            if not isinstance(o, dict):
+                continue
+            if o.get("error"):
+                raise RuntimeError(str(o["error"]))
+            pieces.append((o.get("message") or {}).get("content") or o.get("response") or "")
+            if o.get("done"):
+                break
+        return "".join(pieces)
 
-def _stitch_ndjson(text: str) -> str:
-    if not text:
-        return ""
-    pieces = []
-    for ln in [ln for ln in text.splitlines() if ln.strip()]:
-        try:
-            o = json.loads(ln)
-            if "message" in o and "content" in o["message"]:
-                pieces.append(o["message"]["content"])
-            elif "response" in o:
-                pieces.append(o["response"])
-        except Exception:
-            return text
-    return "".join(pieces) if pieces else text
+_FENCE_HEAD = re.compile(r"^\s*```(?:json)?\s*", re.IGNORECASE)
+_FENCE_TAIL = re.compile(r"\s*```\s*$", re.IGNORECASE)
 
 def _coerce_json_dict(s: str) -> Dict[str, Any]:
     if not s:
         return {}
-    s = re.sub(r"^\s*```(?:json)?\s*", "", s.strip(), flags=re.IGNORECASE)
-    s = re.sub(r"\s*```\s*$", "", s, flags=re.IGNORECASE)
+    s = _FENCE_HEAD.sub("", s.strip())
+    s = _FENCE_TAIL.sub("", s)
     try:
-        o = json.loads(s)
+        o = _loads(s)
         if isinstance(o, dict):
             return o
     except Exception:
@@ -354,41 +598,200 @@ def _coerce_json_dict(s: str) -> Dict[str, Any]:
     start = s.find("{"); end = s.rfind("}")
     if start != -1 and end != -1 and end > start:
         try:
-            o = json.loads(s[start:end+1])
+            o = _loads(s[start:end+1])
             if isinstance(o, dict):
                 return o
         except Exception:
             pass
     return {}
 
+# ============== Semantic cache ==============
+def _embed(text: str) -> Optional[array]:
+    """Unit-length float32 embedding of ``text`` via Ollama, or None if unavailable."""
+    try:
+        r = SESSION.post(f"{OLLAMA_HOST}/api/embed",
+                         json={"model": EMBED_MODEL, "input": text, "keep_alive": OLLAMA_KEEP_ALIVE}, timeout=60)
+        r.raise_for_status()
+        vec = (r.json().get("embeddings") or [None])[0]
+    except Exception:
+        return None
+    if not vec:
+        return None
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return array("f", (x / norm for x in vec))
+
+class SemanticCache:
+    """
+    Summaries keyed by transcript embedding, persisted in SQLite.
+    A lookup is a brute-force cosine scan over the rows for one summarizer
+    model; a hit at or above ``threshold`` returns the stored summary object.
+    Each insert evicts the oldest rows beyond ``max_rows``, which also bounds
+    the scan.
+    """
+
+    def __init__(self, path: str, threshold: float = SEMCACHE_THRESHOLD, max_rows: int = SEMCACHE_MAX_ROWS):
+        self.path = str(path)
+        self.threshold = threshold
+        self.max_rows = max_rows
+        pathlib.Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS semcache (model TEXT, dim INTEGER, embedding BLOB, text TEXT, "
+                "summary_json TEXT, created_at INTEGER DEFAULT (strftime('%s','now')))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS semcache_model ON semcache (model, dim)")
+            conn.execute("CREATE INDEX IF NOT EXISTS semcache_created ON semcache (created_at)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def lookup(self, model: str, emb: array) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT embedding, summary_json FROM semcache WHERE model=? AND dim=?", (model, len(emb))
+            ).fetchall()
+        finally:
+            conn.close()
+        # dim is only a label; skip any blob whose actual size disagrees with it
+        nbytes = len(emb) * emb.itemsize
+        rows = [r for r in rows if len(r[0]) == nbytes]
+        if not rows:
+            return None
+        if np is not None:
+            mat = np.frombuffer(b"".join(r[0] for r in rows), dtype=np.float32).reshape(len(rows), len(emb))
+            sims = mat @ np.frombuffer(emb, dtype=np.float32)
+            best = int(sims.argmax()); score = float(sims[best])
+        else:
+            score, best = max((sum(a * b for a, b in zip(array("f", r[0]), emb, strict=True)), i)
+                              for i, r in enumerate(rows))
+        return _loads(rows[best][1]) if score >= self.threshold else None
+
+    def add(self, model: str, emb: array, text: str, summary_obj: Dict[str, Any]) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO semcache (model, dim, embedding, text, summary_json) VALUES (?,?,?,?,?)",
+                (model, len(emb), emb.tobytes(), text, _dumps(summary_obj)),
+            )
+            conn.execute(
+                "DELETE FROM semcache WHERE rowid IN (SELECT rowid FROM semcache "
+                "ORDER BY created_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
 # ============== Map-Reduce Summary & Tasks ==============
+# Map calls get at most half of SUMMARY_CTX tokens of transcript; the other half
+# covers instructions and the JSON reply, so every call's KV cache is bounded.
+SUMMARY_CTX = int(os.getenv("SUMMARY_CTX", "4096"))
+
+NUM_CTX_MAX = 32768
+NUM_CTX_REPLY = 1024  # headroom for the JSON answer
+
+def run_num_ctx(tok_medium: int) -> int:
+    """The one num_ctx every call (and the prewarm) uses this run.
+
+    Ollama reloads a model whenever num_ctx changes, so sizes don't vary per
+    call. It covers the largest single prompt the run can send: a SUMMARY_CTX
+    chunk, or a whole transcript just under ``tok_medium`` with the longest
+    instructions, rounded up to a power of two (at most 32768).
+    """
+    need = tok_medium + estimate_tokens(COMBINED_INSTR) + NUM_CTX_REPLY
+    return max(SUMMARY_CTX, min(NUM_CTX_MAX, 1 << (need - 1).bit_length()))
+
+NUM_CTX = SUMMARY_CTX  # main() sets run_num_ctx(--token-threshold-medium)
+
+def chunk_chars(text: str, n_tokens: int) -> int:
+    """Characters per chunk for a SUMMARY_CTX // 2 token budget at this text's chars/token."""
+    return max(1000, (SUMMARY_CTX // 2) * len(text) // max(1, n_tokens))
+
 def chunk(text: str, max_chars: int = 7000) -> List[str]:
-    chunks, buf = [], ""
-    for line in text.splitlines():
-        if len(buf) + len(line) + 1 > max_chars:
-            if buf: chunks.append(buf); buf = line
+    if len(text) <= max_chars:
+        return [text] if text else []
+    lines = text.splitlines()
+    if np is not None:
+        # cum[j] - cum[i] is the joined length of lines[i:j] plus one, so each
+        # chunk end is one binary search instead of a per-line Python step
+        cum = np.zeros(len(lines) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, lines), dtype=np.int64, count=len(lines)) + 1, out=cum[1:])
+        chunks: List[str] = []
+        i = 0
+        while i < len(lines):
+            j = max(i + 1, int(np.searchsorted(cum, cum[i] + max_chars + 1, side="right")) - 1)
+            chunks.append("\n".join(lines[i:j]))
+            i = j
+        return chunks
+    # Collect lines per chunk and join once on flush; n tracks the joined length
+    chunks = []
+    cur: List[str] = []
+    n = 0
+    for line in lines:
+        add = len(line) + (1 if cur else 0)
+        if cur and n + add > max_chars:
+            chunks.append("\n".join(cur))
+            cur, n = [line], len(line)
         else:
-            buf = (buf+"\n"+line) if buf else line
-    if buf: chunks.append(buf)
+            cur.append(line)
+            n += add
+    if cur:
+        chunks.append("\n".join(cur))
     return chunks
 
-def summarize_as_json(model: str, full_text: str) -> Dict[str, Any]:
-    parts = chunk(full_text)
+def summarize_as_json(model: str, full_text: str, cache: Optional[SemanticCache] = None,
+                      max_chars: int = 7000) -> Dict[str, Any]:
+    if cache is not None:
+        emb = _embed(full_text)
+        if emb is not None:
+            hit = cache.lookup(model, emb)
+            if hit is not None:
+                return hit
+            obj = _summarize_as_json(model, full_text, max_chars)
+            cache.add(model, emb, full_text, obj)
+            return obj
+    return _summarize_as_json(model, full_text, max_chars)
+
+def _summarize_as_json(model: str, full_text: str, max_chars: int = 7000) -> Dict[str, Any]:
+    parts = chunk(full_text, max_chars)
     if len(parts) == 1:
         obj = ollama_chat_json(model, SUMMARIZE_INSTR, parts[0])
         return _normalize_summary_obj(obj)
 
-    partials = []
-    for i, ch in enumerate(parts, 1):
-        pj = ollama_chat_json(model, SUMMARIZE_INSTR, f"[CHUNK {i}/{len(parts)}]\n\n{ch}")
-        partials.append(_normalize_summary_obj(pj))
+    # Map: chunks are independent, so keep up to OLLAMA_NUM_PARALLEL in flight
+    def _map(item):
+        i, ch = item
+        return _normalize_summary_obj(ollama_chat_json(model, SUMMARIZE_INSTR, f"[CHUNK {i}/{len(parts)}]\n\n{ch}"))
 
-    combined = json.dumps(partials, ensure_ascii=False)
-    final = ollama_chat_json(
-        model, SUMMARIZE_INSTR,
-        "Combine these partial results into one final JSON with shape {summary, bullets}:\n" + combined
-    )
-    return _normalize_summary_obj(final)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(parts), OLLAMA_NUM_PARALLEL))) as ex:
+        partials = list(ex.map(_map, enumerate(parts, 1)))
+        return _tree_reduce(model, partials, ex)
+
+REDUCE_FANOUT = 4
+
+def _tree_reduce(model: str, partials: List[Dict[str, Any]], ex: ThreadPoolExecutor,
+                 fanout: int = REDUCE_FANOUT) -> Dict[str, Any]:
+    """
+    Combine partials in groups of ``fanout`` per level until one remains, so no
+    single reduce prompt grows with the transcript; groups in a level run on ``ex``.
+    """
+    if not partials:
+        return _normalize_summary_obj({})
+
+    def _combine(grp):
+        return _normalize_summary_obj(ollama_chat_json(
+            model, SUMMARIZE_INSTR,
+            "Combine these partial results into one final JSON with shape {summary, bullets}:\n" + _dumps(grp)
+        ))
+
+    while len(partials) > 1:
+        partials = list(ex.map(_combine, [partials[i:i + fanout] for i in range(0, len(partials), fanout)]))
+    return partials[0]
 
 def _normalize_summary_obj(obj: Any) -> Dict[str, Any]:
     if not isinstance(obj, dict):
@@ -400,29 +803,32 @@ def _normalize_summary_obj(obj: Any) -> Dict[str, Any]:
     bullets = [str(b).strip() for b in bullets if str(b).strip()]
     return {"summary": summary, "bullets": bullets}
 
-def extract_tasks_json(model: str, summary_obj: Dict[str, Any]) -> Dict[str, Any]:
-    payload = json.dumps(
-        {"summary": summary_obj.get("summary",""), "bullets": summary_obj.get("bullets",[])},
-        ensure_ascii=False
-    )
-    obj: Dict[str, Any] | None = None
-    for _ in range(3):
+def _chat_tasks(model: str, system: str, user: str) -> Optional[Dict[str, Any]]:
+    """Up to three attempts at a JSON object carrying ``tasks``; None if all fail."""
+    attempts = 3
+    for k in range(attempts):
         try:
-            obj = ollama_chat_json(model, "Return STRICT JSON only.", TASKS_INSTR + "\n\n" + payload)
+            obj = ollama_chat_json(model, system, user)
             if isinstance(obj, dict) and "tasks" in obj:
-                break
+                return obj
         except Exception:
-            time.sleep(0.5)
-    if not isinstance(obj, dict):
-        obj = {"summary": summary_obj.get("summary",""), "bullets": summary_obj.get("bullets",[]), "tasks": []}
-
-    for t in obj.get("tasks", []):
+            pass
+        if k + 1 < attempts:
+            # Exponential backoff with jitter so concurrent workers don't retry in lockstep
+            time.sleep(min(2 ** k, 4) * (0.5 + random.random() * 0.5))
+    return None
+
+def _normalize_tasks(obj: Dict[str, Any]) -> Dict[str, Any]:
+    tasks = obj.get("tasks")
+    obj["tasks"] = tasks = [t for t in tasks if isinstance(t, dict)] if isinstance(tasks, list) else []
+    for t in tasks:
         if not t.get("acceptance"):
             t["acceptance"] = [{"type":"file_exists","args":{"path":"artifacts/{TASK_ID}/output.txt"}}]
         t["title"] = str(t.get("title","")).strip() or "Untitled Task"
         t["description"] = str(t.get("description","")).strip()
         pri = str(t.get("priority","MEDIUM")).upper()
-        if pri not in {"LOW","MEDIUM","HIGH"}: pri = "MEDIUM"
+        if pri not in {"LOW","MEDIUM","HIGH"}:
+            pri = "MEDIUM"
         t["priority"] = pri
         try:
             t["confidence"] = float(t.get("confidence", 0.5))
@@ -430,22 +836,36 @@ def extract_tasks_json(model: str, summary_obj: Dict[str, Any]) -> Dict[str, Any
             t["confidence"] = 0.5
     return obj
 
+def extract_tasks_json(model: str, summary_obj: Dict[str, Any]) -> Dict[str, Any]:
+    payload = _dumps({"summary": summary_obj.get("summary",""), "bullets": summary_obj.get("bullets",[])})
+    obj = _chat_tasks(model, "Return STRICT JSON only.", TASKS_INSTR + "\n\n" + payload)
+    if obj is None:
+        obj = {"summary": summary_obj.get("summary",""), "bullets": summary_obj.get("bullets",[]), "tasks": []}
+    return _normalize_tasks(obj)
+
+def summarize_and_extract_json(model: str, text: str) -> Optional[Dict[str, Any]]:
+    """Summary, bullets and tasks in one call; None if the model never returns tasks."""
+    obj = _chat_tasks(model, COMBINED_INSTR, text)
+    if obj is None:
+        return None
+    return _normalize_tasks({**obj, **_normalize_summary_obj(obj)})
+
 # ============== Write-back ==============
 def write_back(session, trans_id: str, final_obj: Dict[str, Any], write_notes: bool=False) -> str:
     summary_id = uuid.uuid4().hex
     tasks = final_obj.get("tasks", [])
     for t in tasks:
         t["id"] = uuid.uuid4().hex
+    notes = "SET t.notes = $text, t.updated_at = datetime()" if write_notes else ""
     q = """
     MATCH (t:Transcription {id:$tid})
     CREATE (s:Summary {id: $sid, text:$text, bullets:$bullets, created_at: datetime()})
     MERGE (t)-[:HAS_SUMMARY]->(s)
-    WITH t, s
-    FOREACH (_ IN (CASE WHEN $write_notes THEN [1] ELSE [] END) |
-        SET t.notes = $text, t.updated_at = datetime()
-    )
+    """ + notes + """
     WITH s
-    UNWIND $tasks AS tsk
+    CALL {
+      WITH s
+      UNWIND $tasks AS tsk
       CREATE (tk:Task {
         id: tsk.id,
         title: tsk.title,
@@ -457,60 +877,74 @@ def write_back(session, trans_id: str, final_obj: Dict[str, Any], write_notes: b
         acceptance: coalesce(tsk.acceptance, [])
       })
       MERGE (s)-[:GENERATED_TASK]->(tk)
+    }
     RETURN s.id as sid
     """
-    bullets = final_obj.get("bullets") or []
-    sid = session.run(
-        q,
-        tid=trans_id,
-        sid=summary_id,
-        text=final_obj.get("summary",""),
-        bullets=bullets,
-        tasks=tasks,
-        write_notes=bool(write_notes)
-    ).single()["sid"]
-    return sid
+    params = {
+        "tid": trans_id,
+        "sid": summary_id,
+        "text": final_obj.get("summary", ""),
+        "bullets": final_obj.get("bullets") or [],
+        "tasks": tasks,
+    }
+    # Summary, notes and tasks land in one statement; execute_write retries it on
+    # transient errors (deadlocks, leader switches) instead of failing the row.
+    return session.execute_write(lambda tx: tx.run(q, **params).single()["sid"])
 
 # ============== Per-transcription driver (with routing) ==============
 def process_one(session, tnode: Dict[str,Any], include_utterances: bool, dry_run: bool, write_notes: bool,
                 explicit_summarizer: Optional[str], explicit_reasoner: Optional[str],
-                installed: set[str], len_medium: int, len_large: int) -> Optional[str]:
-    row = fetch_one(session, tnode.get("id"), latest=False)
+                installed: set[str], tok_medium: int, tok_large: int,
+                semcache: Optional[SemanticCache] = None, row: Optional[Dict[str, Any]] = None,
+                fuse: bool = True) -> Optional[str]:
+    if row is None:
+        row = fetch_one(session, tnode.get("id"), latest=False, include_utterances=include_utterances)
     if not row:
-        print(f"[{tnode.get('key') or tnode.get('id')}] not found or empty.")
+        logger.info(f"[{tnode.get('key') or tnode.get('id')}] not found or empty.")
         return None
     t = row["t"]; segments, utterances = row["segments"], row["utterances"]
     key = t.get("key") or t.get("id")
     if not segments and not utterances:
-        print(f"[{key}] No text found in Segments/Utterances.")
+        logger.info(f"[{key}] No text found in Segments/Utterances.")
         return None
 
     text = build_transcript(segments, utterances, include_utterances=include_utterances)
-    text_len = estimate_len(text)
-
-    # Route summarizer by length (unless explicitly overridden)
-    summarizer_model = route_summarizer(text_len, installed, explicit_summarizer, len_medium, len_large)
-
-    print(f"[{key}] Items: {len(segments)} segments + {len(utterances)} utterances (included={include_utterances})")
-    print(f"   routing: text_len={text_len} → summarizer={summarizer_model}")
-
-    summary_obj = summarize_as_json(summarizer_model, text)
-
-    # Route reasoner by task category
-    category = classify_task_category(summary_obj)
-    reasoner_model = route_reasoner(category, installed, explicit_reasoner)
-    print(f"   routing: task_category={category} → reasoner={reasoner_model}")
-
-    final_obj = extract_tasks_json(reasoner_model, summary_obj)
+    n_tokens = estimate_tokens(text)
+    logger.info(f"[{key}] Items: {len(segments)} segments + {len(utterances)} utterances (included={include_utterances})")
+
+    final_obj = None
+    if fuse and semcache is None and not explicit_summarizer and n_tokens < tok_medium:
+        # Short transcript: route the reasoner off the transcript itself and get
+        # summary + tasks from a single call instead of summarize-then-extract
+        category = classify_task_category({"summary": text})
+        reasoner_model = summarizer_model = route_reasoner(category, installed, explicit_reasoner)
+        logger.info(f"   routing: tokens={n_tokens} task_category={category} → fused={reasoner_model}")
+        final_obj = summarize_and_extract_json(reasoner_model, text)
+
+    if final_obj is None:
+        # Route summarizer by length (unless explicitly overridden)
+        summarizer_model = route_summarizer(n_tokens, installed, explicit_summarizer, tok_medium, tok_large)
+        # Short transcripts go in whole; longer ones map-reduce over bounded chunks
+        max_chars = len(text) if n_tokens < tok_medium else chunk_chars(text, n_tokens)
+        logger.info(f"   routing: tokens={n_tokens} → summarizer={summarizer_model}")
+
+        summary_obj = summarize_as_json(summarizer_model, text, cache=semcache, max_chars=max_chars)
+
+        # Route reasoner by task category
+        category = classify_task_category(summary_obj)
+        reasoner_model = route_reasoner(category, installed, explicit_reasoner)
+        logger.info(f"   routing: task_category={category} → reasoner={reasoner_model}")
+
+        final_obj = extract_tasks_json(reasoner_model, summary_obj)
 
     if dry_run:
-        print(json.dumps({"transcription": key,
-                          "routing": {"summarizer": summarizer_model, "reasoner": reasoner_model, "category": category},
-                          **final_obj}, indent=2))
+        emit(json.dumps({"transcription": key,
+                         "routing": {"summarizer": summarizer_model, "reasoner": reasoner_model, "category": category},
+                         **final_obj}, indent=2))
         return None
 
     sid = write_back(session, t.get("id"), final_obj, write_notes=write_notes)
-    print(f"[{key}] Wrote Summary {sid} and {len(final_obj.get('tasks',[]))} Task(s).")
+    logger.info(f"[{key}] Wrote Summary {sid} and {len(final_obj.get('tasks',[]))} Task(s).")
     return sid
 
 # ============== Approve & Execute ==============
@@ -568,46 +1002,78 @@ def q_pick_ready(session, limit: int) -> List[str]:
     )
     return [r["id"] for r in res]
 
-def q_attach_run(session, task_id: str, run: Dict[str, Any]):
+def q_get_tasks(session, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Batched q_get_task: one round trip for all ids, keyed by task id."""
     res = session.run(
         """
-        MATCH (task:Task {id:$tid})
+        MATCH (task:Task) WHERE task.id IN $ids
+        OPTIONAL MATCH (s:Summary)-[:GENERATED_TASK]->(task)
+        OPTIONAL MATCH (t:Transcription)-[:HAS_SUMMARY]->(s)
+        RETURN task, s, t
+        """,
+        ids=ids,
+    )
+    out: Dict[str, Dict[str, Any]] = {}
+    for rec in res:
+        task = dict(rec["task"])
+        out.setdefault(task["id"], {
+            "task": task,
+            "summary": dict(rec["s"]) if rec["s"] else None,
+            "transcription": dict(rec["t"]) if rec["t"] else None,
+        })
+    return out
+
+def q_attach_runs(session, runs: List[Dict[str, Any]]) -> None:
+    session.run(
+        """
+        UNWIND $runs AS run
+        MATCH (task:Task {id:run.tid})
         CREATE (r:Run {
-          id: $rid,
-          started_at: datetime($started_at),
-          status: $status,
-          manifest_json: $manifest_json
+          id: run.rid,
+          started_at: datetime(run.started_at),
+          status: run.status,
+          manifest_json: run.manifest_json
         })
         MERGE (task)-[:HAS_RUN]->(r)
-        RETURN r.id AS rid
         """,
-        tid=task_id,
-        rid=run["id"],
-        started_at=run["started_at"],
-        status=run["status"],
-        manifest_json=json.dumps(run.get("manifest", {}), ensure_ascii=False),
-    ).single()
-    return res["rid"]
+        runs=[
+            {
+                "tid": run["manifest"]["task_id"],
+                "rid": run["id"],
+                "started_at": run["started_at"],
+                "status": run["status"],
+                "manifest_json": _dumps(run.get("manifest", {})),
+            }
+            for run in runs
+        ],
+    ).consume()
 
-def q_finish_run(session, task_id: str, run_id: str, success: bool, manifest: Dict[str, Any]):
+def q_finish_runs(session, finished: List[Dict[str, Any]]) -> None:
+    """``finished`` items: {tid, rid, success, manifest}."""
+    ended_at = datetime.datetime.utcnow().isoformat() + "Z"
     session.run(
         """
-        MATCH (task:Task {id:$tid})-[:HAS_RUN]->(r:Run {id:$rid})
-        SET r.status = $rstatus,
-            r.ended_at = datetime($ended_at),
-            r.success = $success,
-            r.manifest_json = $manifest_json,
-            task.status = $tstatus,
+        UNWIND $runs AS run
+        MATCH (task:Task {id:run.tid})-[:HAS_RUN]->(r:Run {id:run.rid})
+        SET r.status = run.status,
+            r.ended_at = datetime(run.ended_at),
+            r.success = run.success,
+            r.manifest_json = run.manifest_json,
+            task.status = run.status,
             task.updated_at = datetime()
         """,
-        tid=task_id,
-        rid=run_id,
-        rstatus = "DONE" if success else "FAILED",
-        tstatus = "DONE" if success else "FAILED",
-        ended_at = datetime.datetime.utcnow().isoformat() + "Z",
-        success = success,
-        manifest_json = json.dumps(manifest, ensure_ascii=False),
-    )
+        runs=[
+            {
+                "tid": f["tid"],
+                "rid": f["rid"],
+                "status": "DONE" if f["success"] else "FAILED",
+                "ended_at": ended_at,
+                "success": f["success"],
+                "manifest_json": _dumps(f["manifest"]),
+            }
+            for f in finished
+        ],
+    ).consume()
 
 def replace_placeholders(s: str, task_id: str) -> str:
     return (s or "").replace("{TASK_ID}", task_id)
@@ -643,7 +1109,7 @@ def acc_regex(args: Dict[str, Any], task_id: str) -> (bool, str):
 def acc_http_ok(args: Dict[str, Any], _task_id: str) -> (bool, str):
     url = args.get("url","")
     try:
-        r = requests.get(url, timeout=10)
+        r = SESSION.get(url, timeout=10)
         ok = 200 <= r.status_code < 300
         return ok, f"url={url} code={r.status_code}"
     except Exception as e:
@@ -695,7 +1161,7 @@ TIME: {datetime.datetime.utcnow().isoformat()}Z
         if a.get("type") == "http_ok" and a.get("args",{}).get("url"):
             url = a["args"]["url"]
             try:
-                r = requests.get(url, timeout=10)
+                r = SESSION.get(url, timeout=10)
                 (artdir / "http.status").write_text(str(r.status_code), encoding="utf-8")
                 (artdir / "http.body.txt").write_text((r.text or "")[:4096], encoding="utf-8")
                 steps.append({"op":"http_get","url":url,"status":r.status_code,"bytes":len(r.content)})
@@ -706,40 +1172,57 @@ TIME: {datetime.datetime.utcnow().isoformat()}Z
 
 def approve_all(session, limit: int) -> int:
     n = q_approve_all_review(session, limit=limit)
-    print(f"Approved {n} task(s) from REVIEW → READY.")
+    logger.info(f"Approved {n} task(s) from REVIEW → READY.")
     return n
 
 def execute_ready(limit: int):
+    # The q_* helpers only call .run() and consume their results, so they double
+    # as managed-transaction functions (retried by the driver on transient errors)
     with neo_driver().session() as s:
-        picked = q_pick_ready(s, limit=limit)
-    if not picked:
-        print("No READY tasks."); return
-
-    for tid in picked:
-        with neo_driver().session() as s:
-            row = q_get_task(s, tid)
-            if not row:
-                print(f"{tid}: not found"); continue
-            task = row["task"]
-            run = {
+        picked = s.execute_write(q_pick_ready, limit)
+        if not picked:
+            logger.info("No READY tasks."); return
+
+        rows = s.execute_read(q_get_tasks, picked)
+        runs = []
+        for tid in picked:
+            if tid not in rows:
+                logger.info(f"{tid}: not found"); continue
+            runs.append({
                 "id": str(uuid.uuid4()),
                 "started_at": datetime.datetime.utcnow().isoformat()+"Z",
                 "status": "RUNNING",
                 "manifest": {"task_id": tid, "steps": [], "acceptance_results": []},
-            }
-            q_attach_run(s, tid, run)
-
-        manifest_exec = execute_task_minimal(task)
-        results = run_acceptance(task, tid)
-        success = all(r["passed"] for r in results) if results else True
-
-        run["manifest"].update(manifest_exec)
-        run["manifest"]["acceptance_results"] = results
-
-        with neo_driver().session() as s:
-            q_finish_run(s, tid, run["id"], success, run["manifest"])
-
-        print(f"{tid}: {'DONE' if success else 'FAILED'}  artifacts={manifest_exec['artifacts_dir']}")
+            })
+        if not runs:
+            return
+        s.execute_write(q_attach_runs, runs)
+
+        # Execute outside any transaction, then finalize all runs in one write;
+        # the finally still records what finished if the loop itself dies
+        finished = []
+        try:
+            for run in runs:
+                tid = run["manifest"]["task_id"]
+                task = rows[tid]["task"]
+                try:
+                    manifest_exec = execute_task_minimal(task)
+                    results = run_acceptance(task, tid)
+                except Exception as e:
+                    run["manifest"]["error"] = f"{type(e).__name__}: {e}"
+                    finished.append({"tid": tid, "rid": run["id"], "success": False, "manifest": run["manifest"]})
+                    logger.error(f"{tid}: FAILED  error={run['manifest']['error']}")
+                    continue
+                success = all(r["passed"] for r in results) if results else True
+
+                run["manifest"].update(manifest_exec)
+                run["manifest"]["acceptance_results"] = results
+                finished.append({"tid": tid, "rid": run["id"], "success": success, "manifest": run["manifest"]})
+
+                logger.info(f"{tid}: {'DONE' if success else 'FAILED'}  artifacts={manifest_exec['artifacts_dir']}")
+        finally:
+            if finished:
+                s.execute_write(q_finish_runs, finished)
 
 # ============== CLI ==============
 def main():
@@ -747,9 +1230,12 @@ def main():
     sel = ap.add_mutually_exclusive_group()
     sel.add_argument("--id", dest="trans_id", help="Transcription.id to process")
     sel.add_argument("--latest", action="store_true", help="Pick the latest Transcription")
-    sel.add_argument("--all-missing", action="store_true", help="Process transcriptions missing notes (no Summary OR empty t.notes)")
+    sel.add_argument("--all-missing", action="store_true", help="Process transcriptions with no Summary (or empty t.notes, with --write-notes)")
 
     ap.add_argument("--limit", type=int, default=50, help="Max items when using --all-missing")
+    ap.add_argument("--page-size", type=int, default=200, help="Candidates fetched per round-trip with --all-missing")
+    ap.add_argument("--concurrency", type=int, default=SUMMARIZE_WORKERS,
+                    help="Transcriptions processed in parallel with --all-missing (default SUMMARIZE_WORKERS)")
     ap.add_argument("--include-utterances", action="store_true", help="Include UTTERANCE as LOW_CONF lines")
     ap.add_argument("--write-notes", action="store_true", help="Also write summary text into t.notes")
     ap.add_argument("--dry-run", action="store_true", help="Print JSON only (no writes)")
@@ -765,57 +1251,117 @@ def main():
     # Model overrides
     ap.add_argument("--model-summarizer", help="Override summarizer model tag")
     ap.add_argument("--model-reasoner", help="Override reasoner/coder model tag")
-
-    # Length thresholds for routing
-    ap.add_argument("--len-threshold-medium", type=int, default=DEFAULT_LEN_MEDIUM)
-    ap.add_argument("--len-threshold-large",  type=int, default=DEFAULT_LEN_LARGE)
+    ap.add_argument("--prefer-quant", default=os.getenv("PREFER_QUANT") or None,
+                    help="Prefer installed builds of routed models with this quant tag (e.g. q4_K_M)")
+
+    # Token thresholds for routing
+    ap.add_argument("--token-threshold-medium", type=int, default=DEFAULT_TOK_MEDIUM)
+    ap.add_argument("--token-threshold-large",  type=int, default=DEFAULT_TOK_LARGE)
+    # Hidden character-count aliases kept for existing cron/CLI invocations
+    ap.add_argument("--len-threshold-medium", dest="token_threshold_medium", type=_chars_as_tokens,
+                    default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+    ap.add_argument("--len-threshold-large", dest="token_threshold_large", type=_chars_as_tokens,
+                    default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+
+    ap.add_argument("--two-pass", action="store_true",
+                    help="Always summarize then extract tasks (short transcripts otherwise use one fused call)")
+    ap.add_argument("--no-prewarm", action="store_true",
+                    help="Skip loading every routable model before summarizing")
+    ap.add_argument("--semantic-cache", action="store_true",
+                    help="Reuse summaries of near-duplicate transcripts (ARTIFACTS_DIR/semcache.db)")
 
     # Artifacts dir
     ap.add_argument("--artifacts-dir", help="Override ARTIFACTS_DIR (default ./artifacts)")
 
     args = ap.parse_args()
-    global ARTIFACTS_DIR
+    setup_logging()
+    global ARTIFACTS_DIR, PREFER_QUANT, NUM_CTX
+    PREFER_QUANT = args.prefer_quant
+    NUM_CTX = run_num_ctx(args.token_threshold_medium)
     if args.artifacts_dir:
         ARTIFACTS_DIR = args.artifacts_dir
 
     # Discovery and listing
+    driver = neo_driver()
+    ensure_indexes(driver)
     installed = installed_models()
+    semcache = SemanticCache(pathlib.Path(ARTIFACTS_DIR) / "semcache.db") if args.semantic_cache else None
 
     if args.list_status:
-        with neo_driver().session() as s:
+        with driver.session() as s:
             rows = q_list(s, status=args.list_status, limit=50)
         if not rows:
-            print("(none)")
+            emit("(none)")
         else:
             for r in rows:
-                print(f"[{r.get('tkey') or ''}] {r['id']}  {r['priority']:>6}  {r['title']}")
+                emit(f"[{r.get('tkey') or ''}] {r['id']}  {r['priority']:>6}  {r['title']}")
         return
 
     # Summarize targets if specified
     did_summarize = False
-    with neo_driver().session() as sess:
+    with driver.session() as sess:
         if args.trans_id or args.latest or args.all_missing:
             did_summarize = True
+            if not args.no_prewarm:
+                prewarm_models(run_models(installed, args.model_summarizer, args.model_reasoner,
+                                          args.token_threshold_medium, args.token_threshold_large))
             if args.trans_id or args.latest:
+                row = None
                 if args.latest and not args.trans_id:
-                    row = fetch_one(sess, None, latest=True)
+                    row = fetch_one(sess, None, latest=True, include_utterances=args.include_utterances)
                     if not row:
-                        print("No Transcription found."); return
+                        logger.info("No Transcription found."); return
                     tnode = row["t"]
                 else:
                     tnode = {"id": args.trans_id}
                 process_one(sess, tnode, args.include_utterances, args.dry_run, args.write_notes,
                             args.model_summarizer, args.model_reasoner, installed,
-                            args.len_threshold_medium, args.len_threshold_large)
+                            args.token_threshold_medium, args.token_threshold_large, semcache,
+                            row=row, fuse=not args.two_pass)
             else:
-                cands = fetch_missing_transcriptions(sess, limit=args.limit)
-                if not cands:
-                    print("No candidates found (all have notes/summaries).")
-                else:
-                    for tnode in cands:
-                        process_one(sess, tnode, args.include_utterances, args.dry_run, args.write_notes,
-                                    args.model_summarizer, args.model_reasoner, installed,
-                                    args.len_threshold_medium, args.len_threshold_large)
+                # Transcriptions are independent; sessions aren't thread-safe,
+                # so each pool thread keeps one session for all its rows.
+                local, sessions = threading.local(), []
+
+                def _one(tnode, row):
+                    if row is None:
+                        logger.info(f"[{tnode.get('key') or tnode.get('id')}] not found or empty.")
+                        return None
+                    s = getattr(local, "session", None)
+                    if s is None:
+                        s = local.session = driver.session()
+                        sessions.append(s)
+                    return process_one(s, tnode, args.include_utterances, args.dry_run, args.write_notes,
+                                       args.model_summarizer, args.model_reasoner, installed,
+                                       args.token_threshold_medium, args.token_threshold_large, semcache,
+                                       row=row, fuse=not args.two_pass)
+
+                # Page through candidates; each page's segments/utterances come
+                # back in one round-trip and are handed to the pool while the
+                # next page is fetched.
+                page = max(1, min(args.page_size, args.limit))
+                seen, cursor, futures = 0, None, []
+                with ThreadPoolExecutor(max_workers=max(1, min(args.concurrency, args.limit))) as ex:
+                    while seen < args.limit:
+                        cands, cursor = fetch_missing_transcriptions_paged(
+                            sess, page=min(page, args.limit - seen), after=cursor,
+                            need_notes=args.write_notes)
+                        if not cands:
+                            break
+                        seen += len(cands)
+                        rows = fetch_many(sess, [c["id"] for c in cands if c.get("id")],
+                                          include_utterances=args.include_utterances)
+                        futures += [ex.submit(_one, c, rows.get(c.get("id"))) for c in cands]
+                        if cursor is None:
+                            break
+                try:
+                    for f in futures:
+                        f.result()
+                finally:
+                    for s in sessions:
+                        s.close()
+                if not seen:
+                    logger.info("No candidates found (all have notes/summaries).")
 
     # Approve & Execute phases (independent)
     if args.approve_all is not None:
@@ -825,7 +1371,7 @@ def main():
         execute_ready(args.execute_ready)
 
     if not did_summarize and args.approve_all is None and args.execute_ready == 0 and not args.list_status:
-        print("Nothing to do. Provide --id/--latest/--all-missing to summarize, or --approve-all / --execute-ready, or --list STATUS.")
+        logger.info("Nothing to do. Provide --id/--latest/--all-missing to summarize, or --approve-all / --execute-ready, or --list STATUS.")
 
 if __name__ == "__main__":
     main()
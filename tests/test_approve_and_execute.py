@@ -0,0 +1,113 @@
+import argparse
+import json
+
+import pytest
+
+import scripts.approve_and_execute as aae
+
+
+class _Result(list):
+    def consume(self):
+        return None
+
+    def single(self):
+        return self[0] if self else None
+
+
+class _Session:
+    """Records every query; answers the ones cmd_execute reads from."""
+
+    def __init__(self, tasks):
+        self.tasks = tasks
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.calls.append((" ".join(query.split()), params))
+        if "SET task.status = 'RUNNING'" in query:
+            return _Result({"id": t["id"]} for t in self.tasks)
+        if "WHERE task.id IN $ids" in query:
+            return _Result({"task": t, "s": None, "t": None} for t in self.tasks if t["id"] in params["ids"])
+        return _Result()
+
+    def session(self):
+        return self
+
+    def queries(self, marker):
+        return [p for q, p in self.calls if marker in q]
+
+
+def test_q_get_tasks_is_one_round_trip_keyed_by_first_row():
+    s = _Session([{"id": "a"}, {"id": "b"}])
+    s.run = lambda query, **params: s.calls.append(params) or _Result([
+        {"task": {"id": "a"}, "s": {"id": "s1"}, "t": None},
+        {"task": {"id": "a"}, "s": {"id": "s2"}, "t": None},  # a second summary of the same task
+        {"task": {"id": "b"}, "s": None, "t": None},
+    ])
+    rows = aae.q_get_tasks(s, ["a", "b", "missing"])
+    assert s.calls == [{"ids": ["a", "b", "missing"]}]
+    assert set(rows) == {"a", "b"}
+    assert rows["a"]["summary"] == {"id": "s1"}
+
+
+def test_attach_and_finish_runs_send_one_unwind_per_batch():
+    s = _Session([])
+    runs = [{"id": f"r{i}", "started_at": aae._utcnow(), "status": "RUNNING",
+             "manifest": {"task_id": f"t{i}"}} for i in range(3)]
+    aae.q_attach_runs(s, runs)
+    aae.q_finish_runs(s, [{"tid": r["manifest"]["task_id"], "rid": r["id"], "success": i != 1,
+                           "manifest": r["manifest"]} for i, r in enumerate(runs)])
+
+    assert len(s.calls) == 2
+    (attach_q, attach), (finish_q, finish) = s.calls
+    assert attach_q.startswith("UNWIND $runs") and [r["rid"] for r in attach["runs"]] == ["r0", "r1", "r2"]
+    assert finish_q.startswith("UNWIND $runs")
+    assert [r["status"] for r in finish["runs"]] == ["DONE", "FAILED", "DONE"]
+
+
+def _execute(monkeypatch, tmp_path, tasks):
+    s = _Session(tasks)
+    monkeypatch.setattr(aae, "neo", lambda: s)
+    monkeypatch.setattr(aae, "ARTIFACTS_DIR", str(tmp_path))
+    return s
+
+
+def test_cmd_execute_records_a_failing_task_and_keeps_going(monkeypatch, tmp_path):
+    s = _execute(monkeypatch, tmp_path, [{"id": "ok"}, {"id": "boom"}, {"id": "ok2"}])
+    real = aae.execute_task_minimal
+
+    def flaky(task, http=None):
+        if task["id"] == "boom":
+            raise OSError("disk full")
+        return real(task, http)
+
+    monkeypatch.setattr(aae, "execute_task_minimal", flaky)
+    aae.cmd_execute(argparse.Namespace(limit=3))
+
+    assert len(s.queries("CREATE (r:Run")) == 1
+    (finish,) = s.queries("SET r.status = run.status")
+    by_tid = {r["tid"]: r for r in finish["runs"]}
+    assert [by_tid[t]["status"] for t in ("ok", "boom", "ok2")] == ["DONE", "FAILED", "DONE"]
+    assert json.loads(by_tid["boom"]["manifest_json"])["error"] == "OSError: disk full"
+
+
+def test_cmd_execute_finalizes_finished_runs_when_the_loop_dies(monkeypatch, tmp_path):
+    s = _execute(monkeypatch, tmp_path, [{"id": "first"}, {"id": "second"}])
+    real = aae.run_acceptance
+
+    def interrupt_second(task, task_id, http=None):
+        if task_id == "second":
+            raise KeyboardInterrupt
+        return real(task, task_id, http)
+
+    monkeypatch.setattr(aae, "run_acceptance", interrupt_second)
+    with pytest.raises(KeyboardInterrupt):
+        aae.cmd_execute(argparse.Namespace(limit=2))
+
+    (finish,) = s.queries("SET r.status = run.status")
+    assert [(r["tid"], r["status"]) for r in finish["runs"]] == [("first", "DONE")]
@@ -0,0 +1,13 @@
+from assistx.pipeline_summarize import infer_acceptance
+
+
+def test_infer_acceptance_matches_keywords():
+    checks = infer_acceptance({"title": "Write the weekly Report", "description": "publish to the site"})
+    types = [c["type"] for c in checks]
+    assert types == ["file_exists", "contains", "http_ok"]
+
+
+def test_infer_acceptance_matches_word_prefixes_only():
+    assert infer_acceptance({"title": "Reports for https links"}) is not None
+    # "rapid" contains "api" but not at a word start
+    assert infer_acceptance({"title": "rapid cleanup", "description": ""}) is None
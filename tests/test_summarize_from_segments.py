@@ -0,0 +1,137 @@
+import pytest
+
+import scripts.summarize_from_segments as sfs
+
+
+def test_quant_candidates_latest_stays_on_the_same_model_name(monkeypatch):
+    monkeypatch.setattr(sfs, "PREFER_QUANT", "q4_K_M")
+    installed = {
+        "qwen2.5:7b-instruct-q4_K_M",
+        "qwen2.5-coder:7b-instruct-q4_K_M",
+        "qwen2.5-coder:7b-instruct-q8_0",
+        "llama3:8b-instruct-q4_K_M",
+        "llama3:70b-instruct-q4_K_M",
+    }
+    assert sfs._quant_candidates("qwen2.5-coder:latest", installed) == ["qwen2.5-coder:7b-instruct-q4_K_M"]
+    assert sfs._quant_candidates("qwen2.5:latest", installed) == ["qwen2.5:7b-instruct-q4_K_M"]
+    assert sfs._quant_candidates("llama3:latest", installed) == ["llama3:8b-instruct-q4_K_M"]
+    assert sfs._quant_candidates("qwen2.5-coder:3b", installed) == []
+
+
+def test_semantic_cache_evicts_oldest_rows_past_the_cap(tmp_path):
+    import math
+    import sqlite3
+    from array import array
+
+    def emb(i):
+        return array("f", [math.cos(i / 2), math.sin(i / 2)])
+
+    cache = sfs.SemanticCache(str(tmp_path / "semcache.db"), max_rows=3)
+    for i in range(5):
+        cache.add("m", emb(i), f"t{i}", {"i": i})
+
+    rows = sqlite3.connect(cache.path).execute("SELECT text FROM semcache ORDER BY rowid").fetchall()
+    assert [r[0] for r in rows] == ["t2", "t3", "t4"]
+    assert cache.lookup("m", emb(4)) == {"i": 4}
+    assert cache.lookup("m", emb(0)) is None
+
+
+def test_emit_prints_without_logging_setup(capsys):
+    sfs.emit('{"transcription": "k"}')
+    assert capsys.readouterr().out == '{"transcription": "k"}\n'
+
+
+def test_chunk_numpy_and_list_paths_agree(monkeypatch):
+    import random
+
+    if sfs.np is None:
+        pytest.skip("numpy not installed")
+    rng = random.Random(7)
+    texts = ["\n".join("x" * rng.randint(0, 90) for _ in range(rng.randint(1, 200))) for _ in range(25)]
+    texts.append("short\n" + "y" * 500 + "\nz")  # a line longer than max_chars gets its own chunk
+    for max_chars in (50, 120, 400):
+        with_np = [sfs.chunk(t, max_chars) for t in texts]
+        monkeypatch.setattr(sfs, "np", None)
+        without_np = [sfs.chunk(t, max_chars) for t in texts]
+        monkeypatch.undo()
+        assert with_np == without_np
+        for t, parts in zip(texts, with_np, strict=True):
+            assert "\n".join(parts) == t
+
+
+def test_tree_reduce_combines_at_most_fanout_partials_per_call(monkeypatch):
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    groups = []
+
+    def fake_chat(model, system, user, temperature=0.2):
+        grp = json.loads(user.split("\n", 1)[1])
+        groups.append(len(grp))
+        return {"summary": "+".join(p["summary"] for p in grp), "bullets": []}
+
+    monkeypatch.setattr(sfs, "ollama_chat_json", fake_chat)
+    partials = [{"summary": str(i), "bullets": []} for i in range(9)]
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        out = sfs._tree_reduce("m", partials, ex, fanout=4)
+
+    assert max(groups) <= 4
+    assert sorted(groups) == [1, 3, 4, 4]  # 9 -> 3 -> 1
+    assert out["summary"] == "0+1+2+3+4+5+6+7+8"
+
+
+def test_run_num_ctx_floor_cap_and_power_of_two(monkeypatch):
+    monkeypatch.setattr(sfs, "SUMMARY_CTX", 4096)
+    assert sfs.run_num_ctx(0) == 4096
+    assert sfs.run_num_ctx(10**6) == sfs.NUM_CTX_MAX
+
+    ctx = sfs.run_num_ctx(7500)
+    need = 7500 + sfs.estimate_tokens(sfs.COMBINED_INSTR) + sfs.NUM_CTX_REPLY
+    assert ctx >= need and ctx < 2 * need
+    assert ctx & (ctx - 1) == 0
+
+
+class _TrickleRaw:
+    """Response body that hands out a few bytes per read, splitting UTF-8 sequences."""
+
+    def __init__(self, data, step=3):
+        self.data, self.step = data, step
+
+    def read(self, n=-1, **kw):
+        out, self.data = self.data[:self.step], self.data[self.step:]
+        return out
+
+    def close(self):
+        pass
+
+
+def test_stream_ollama_joins_multibyte_text_split_across_reads(monkeypatch):
+    import json
+
+    import requests
+
+    lines = [{"message": {"content": "héllo "}}, {"message": {"content": "wörld — ✓"}}, {"done": True}]
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.raw = _TrickleRaw("\n".join(json.dumps(o, ensure_ascii=False) for o in lines).encode("utf-8"))
+    monkeypatch.setattr(sfs, "_post_ollama", lambda *a, **kw: resp)
+
+    assert sfs._stream_ollama("/api/chat", {}) == "héllo wörld — ✓"
+
+    # Non-JSON lines are kept verbatim, so they must come back as decoded str too
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.raw = _TrickleRaw("naïve — ✓".encode())
+    assert sfs._stream_ollama("/api/generate", {}) == "naïve — ✓"
+
+
+@pytest.mark.parametrize("summary, bullets, expected", [
+    ("Deploy the service with docker, then write the spec", [], "requirements"),
+    ("Refactor the module before the staging release", [], "coding_build"),
+    ("Sketch the architecture", ["ship it to prod"], "mvp_design"),
+    ("Roll out to kubernetes", [], "ops_deploy"),
+    ("Read up on vector databases", ["compare options"], "research"),
+    ("Encoded as barcode", [], "research"),  # keywords only match whole words
+])
+def test_classify_task_category_prefers_highest_ranked_match(summary, bullets, expected):
+    assert sfs.classify_task_category({"summary": summary, "bullets": bullets}) == expected
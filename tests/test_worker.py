@@ -6,3 +6,121 @@ def test_worker_name_includes_hostname_and_pid(monkeypatch):
     monkeypatch.setattr(worker_mod.os, "getpid", lambda: 4321)
 
     assert worker_mod._worker_name(2) == "assistx-worker-2-test-host-4321"
+
+
+def test_pubsub_error_ignores_idle_timeout(monkeypatch):
+    from redis.exceptions import TimeoutError as RedisTimeoutError
+
+    slept = []
+    monkeypatch.setattr(worker_mod.time, "sleep", slept.append)
+    worker_mod._pubsub_error(RedisTimeoutError("idle"), None, None)
+    assert slept == []
+    worker_mod._pubsub_error(ConnectionError("gone"), None, None)
+    assert slept == [1.0]
+
+
+class _Lists:
+    """Just enough of a Redis client for BatchWorker's list moves."""
+
+    def __init__(self, **lists):
+        self.lists = {k: [v.encode() for v in vs] for k, vs in lists.items()}
+        self.workers = set()
+
+    def pipeline(self, transaction=True):
+        conn, calls = self, []
+
+        class _Pipe:
+            def lmove(self, *args):
+                calls.append(args)
+
+            def execute(self):
+                return [conn.lmove(*args) for args in calls]
+
+        return _Pipe()
+
+    def lmove(self, src, dst, wherefrom, whereto):
+        items = self.lists.get(src) or []
+        if not items:
+            return None
+        value = items.pop(0 if wherefrom == "LEFT" else -1)
+        target = self.lists.setdefault(dst, [])
+        target.insert(0 if whereto == "LEFT" else len(target), value)
+        return value
+
+    def lrem(self, key, count, value):
+        self.lists.get(key, []).remove(value.encode())
+
+    def scan_iter(self, match):
+        return [k.encode() for k in self.lists if k.startswith(match.rstrip("*"))]
+
+    def exists(self, key):
+        return key in self.workers
+
+
+class _Queue:
+    key = "rq:queue:assistx"
+    name = "assistx"
+
+
+def _batch_worker(conn, prefetch=4):
+    w = object.__new__(worker_mod.BatchWorker)
+    w.connection, w.serializer, w.name = conn, None, "w1"
+    w.prefetch, w._prefetched = prefetch, worker_mod.deque()
+    w.queues = [_Queue()]
+    return w
+
+
+def test_batch_worker_parks_prefetched_ids_in_its_processing_list():
+    class _Job:
+        def __init__(self, job_id):
+            self.id = job_id
+
+        @classmethod
+        def fetch_many(cls, ids, connection, serializer=None):
+            return [None if i == "gone" else cls(i) for i in ids]
+
+    conn = _Lists(**{_Queue.key: ["j2", "gone", "j3", "j4"]})
+    w = _batch_worker(conn)
+    w.job_class = _Job
+    w.get_redis_server_version = lambda: (7, 2, 0)
+    w._fill(_Queue())
+
+    processing = f"{_Queue.key}:prefetched:w1"
+    assert [job.id for job, _ in w._prefetched] == ["j2", "j3"]
+    assert conn.lists[processing] == [b"j2", b"j3"]
+    assert conn.lists[_Queue.key] == [b"j4"]
+
+    w.heartbeat = lambda: None
+    w.log = worker_mod.logger
+    job, _ = w.dequeue_job_and_maintain_ttl(1)
+    assert job.id == "j2" and conn.lists[processing] == [b"j3"]
+
+
+def test_batch_worker_requeues_ids_left_by_a_dead_worker(monkeypatch):
+    monkeypatch.setattr(worker_mod.BlockingPubSubWorker, "run_maintenance_tasks", lambda self: None)
+    conn = _Lists(**{
+        _Queue.key: ["j9"],
+        f"{_Queue.key}:prefetched:dead": ["j1", "j2"],
+        f"{_Queue.key}:prefetched:alive": ["j5"],
+    })
+    conn.workers.add("rq:worker:alive")
+    w = _batch_worker(conn)
+    w.log = worker_mod.logger
+    w.run_maintenance_tasks()
+
+    assert conn.lists[_Queue.key] == [b"j1", b"j2", b"j9"]
+    assert conn.lists[f"{_Queue.key}:prefetched:alive"] == [b"j5"]
+
+
+def test_redis_url_prefers_env_then_local_socket(monkeypatch, tmp_path):
+    from assistx import deps
+
+    sock = tmp_path / "redis.sock"
+    monkeypatch.setattr(deps, "REDIS_SOCKET", str(sock))
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    assert deps.redis_url() == "redis://redis:6379/0"
+    assert deps.redis_url(default="redis://localhost:6379/0") == "redis://localhost:6379/0"
+    sock.touch()
+    assert deps.redis_url() == f"unix://{sock}"
+    monkeypatch.setenv("REDIS_URL", "redis://elsewhere:6379/1")
+    assert deps.redis_url() == "redis://elsewhere:6379/1"